@@ -0,0 +1,183 @@
+"""
+_kernels — Numba-compiled indicator decision ladders.
+Each kernel takes plain floats (indicator values + thresholds) and returns
+(direction, confidence, branch): direction is DIR_LONG / DIR_SHORT /
+DIR_NEUTRAL, branch selects the description template in indicators.DESC.
+Thresholds are passed in rather than read from config so cached machine
+code never goes stale when the config changes.
+"""
+
+import numpy as np
+
+from numba_compat import load_aot, njit
+
+DIR_NEUTRAL = 0
+DIR_LONG = 1
+DIR_SHORT = -1
+
+
+# min()/max() with Python's NaN semantics (the first argument wins ties/NaN)
+@njit(cache=True, nogil=True)
+def _min(a, b):
+    return b if b < a else a
+
+
+@njit(cache=True, nogil=True)
+def _max(a, b):
+    return b if b > a else a
+
+
+@njit(cache=True, nogil=True, inline="always")
+def _conf_ratio(num, den, scale, cap):
+    """min(|num| / (|den| + 1e-10) * scale, cap) as one scalar expression."""
+    return _min(abs(num) / (abs(den) + 1e-10) * scale, cap)
+
+
+# Zone bits → branch for the oscillator ladders (RSI, StochRSI). Bits:
+# 1 = below oversold, 2 = above overbought, 4 = bullish cross, 8 = bearish cross.
+# Crosses take priority over zones, bullish over bearish — same order as the
+# original if/elif chain, so each kernel branches once on the looked-up id.
+ZONE_TABLE = np.array(
+    [1 if z & 4 else 2 if z & 8 else 3 if z & 1 else 4 if z & 2 else 0 for z in range(16)],
+    dtype=np.int8,
+)
+
+
+@njit(cache=True, nogil=True)
+def ema_cross_decide(prev_fast, curr_fast, prev_slow, curr_slow):
+    # Bullish / bearish crossover
+    if prev_fast <= prev_slow and curr_fast > curr_slow:
+        return DIR_LONG, _min(abs(curr_fast - curr_slow) / curr_slow * 100 / 0.5, 1.0), 1
+    if prev_fast >= prev_slow and curr_fast < curr_slow:
+        return DIR_SHORT, _min(abs(curr_fast - curr_slow) / curr_slow * 100 / 0.5, 1.0), 2
+
+    # Trend continuation (no crossover but clear separation)
+    if curr_fast > curr_slow:
+        gap_pct = (curr_fast - curr_slow) / curr_slow * 100
+        if gap_pct > 0.3:
+            return DIR_LONG, _min(gap_pct / 1.0, 0.6), 3
+    elif curr_fast < curr_slow:
+        gap_pct = (curr_slow - curr_fast) / curr_slow * 100
+        if gap_pct > 0.3:
+            return DIR_SHORT, _min(gap_pct / 1.0, 0.6), 4
+
+    return DIR_NEUTRAL, 0.0, 0
+
+
+@njit(cache=True, nogil=True)
+def rsi_decide(prev, curr, oversold, overbought):
+    zone = (int(curr < oversold)
+            | int(curr > overbought) << 1
+            | int(prev <= oversold and curr > oversold) << 2
+            | int(prev >= overbought and curr < overbought) << 3)
+    branch = ZONE_TABLE[zone]
+
+    # Crossing back out of oversold / overbought
+    if branch == 1:
+        conf = _min((oversold - (prev + curr) / 2 + 10) / 20, 1.0)
+        return DIR_LONG, _max(conf, 0.5), 1
+    if branch == 2:
+        conf = _min(((prev + curr) / 2 - overbought + 10) / 20, 1.0)
+        return DIR_SHORT, _max(conf, 0.5), 2
+
+    # Deep zones
+    if branch == 3:
+        return DIR_LONG, _min((oversold - curr) / 15, 0.7), 3
+    if branch == 4:
+        return DIR_SHORT, _min((curr - overbought) / 15, 0.7), 4
+
+    return DIR_NEUTRAL, 0.0, 0
+
+
+@njit(cache=True, nogil=True)
+def macd_decide(prev_macd, curr_macd, prev_signal, curr_signal, prev_hist, curr_hist):
+    # Signal-line crossovers
+    if prev_macd <= prev_signal and curr_macd > curr_signal:
+        conf = _conf_ratio(curr_hist, curr_macd, 2.0, 1.0)
+        return DIR_LONG, _max(conf, 0.6), 1
+    if prev_macd >= prev_signal and curr_macd < curr_signal:
+        conf = _conf_ratio(curr_hist, curr_macd, 2.0, 1.0)
+        return DIR_SHORT, _max(conf, 0.6), 2
+
+    # Histogram momentum
+    if curr_hist > 0 and curr_hist > prev_hist:
+        return DIR_LONG, 0.4, 3
+    if curr_hist < 0 and curr_hist < prev_hist:
+        return DIR_SHORT, 0.4, 4
+
+    return DIR_NEUTRAL, 0.0, 0
+
+
+@njit(cache=True, nogil=True)
+def bollinger_decide(prev_close, close, prev_lower, lower, prev_upper, upper):
+    band_width = upper - lower
+    if band_width == 0:
+        return DIR_NEUTRAL, 0.0, 5
+
+    # Bounce off lower band / rejection from upper band
+    if prev_close <= prev_lower and close > lower:
+        return DIR_LONG, _max(_min((close - lower) / band_width * 2, 1.0), 0.6), 1
+    if prev_close >= prev_upper and close < upper:
+        return DIR_SHORT, _max(_min((upper - close) / band_width * 2, 1.0), 0.6), 2
+
+    # Outside the bands
+    if close < lower:
+        return DIR_LONG, _min((lower - close) / band_width * 3, 0.8), 3
+    if close > upper:
+        return DIR_SHORT, _min((close - upper) / band_width * 3, 0.8), 4
+
+    return DIR_NEUTRAL, 0.0, 0
+
+
+@njit(cache=True, nogil=True)
+def stochrsi_decide(prev_k, curr_k, prev_d, curr_d, oversold, overbought):
+    zone = (int(curr_k < oversold)
+            | int(curr_k > overbought) << 1
+            | int(prev_k <= prev_d and curr_k > curr_d and curr_k < oversold + 10) << 2
+            | int(prev_k >= prev_d and curr_k < curr_d and curr_k > overbought - 10) << 3)
+    branch = ZONE_TABLE[zone]
+
+    # %K/%D crossovers near the extremes
+    if branch == 1:
+        return DIR_LONG, _max(_min((oversold + 10 - curr_k) / 20, 1.0), 0.6), 1
+    if branch == 2:
+        return DIR_SHORT, _max(_min((curr_k - overbought + 10) / 20, 1.0), 0.6), 2
+
+    # Deep zones
+    if branch == 3:
+        return DIR_LONG, 0.4, 3
+    if branch == 4:
+        return DIR_SHORT, 0.4, 4
+
+    return DIR_NEUTRAL, 0.0, 0
+
+
+@njit(cache=True, nogil=True)
+def adx_decide(adx_val, plus_di, minus_di, threshold):
+    if adx_val < threshold:
+        return DIR_NEUTRAL, 0.0, 0
+
+    conf = _min((adx_val - threshold) / 25, 1.0)
+    if plus_di > minus_di:
+        return DIR_LONG, _min(conf + (plus_di - minus_di) / 30, 1.0), 1
+    return DIR_SHORT, _min(conf + (minus_di - plus_di) / 30, 1.0), 2
+
+
+_aot = load_aot("ema_cross_decide", "rsi_decide", "macd_decide",
+                "bollinger_decide", "stochrsi_decide", "adx_decide")
+if _aot is not None:
+    # Prebuilt by build_kernels.py — no JIT compile at startup
+    ema_cross_decide = _aot.ema_cross_decide
+    rsi_decide = _aot.rsi_decide
+    macd_decide = _aot.macd_decide
+    bollinger_decide = _aot.bollinger_decide
+    stochrsi_decide = _aot.stochrsi_decide
+    adx_decide = _aot.adx_decide
+else:
+    # Compile every kernel at import so the first scan doesn't pay for it
+    ema_cross_decide(1.0, 1.0, 1.0, 1.0)
+    rsi_decide(50.0, 50.0, 30.0, 70.0)
+    macd_decide(0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    bollinger_decide(1.0, 1.0, 0.0, 0.0, 2.0, 2.0)
+    stochrsi_decide(50.0, 50.0, 50.0, 50.0, 20.0, 80.0)
+    adx_decide(10.0, 1.0, 1.0, 25.0)
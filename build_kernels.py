@@ -0,0 +1,62 @@
+"""
+build_kernels — ahead-of-time build of the Numba kernels.
+Compiles the fast_ta recurrences, the _kernels decision ladders and the
+data_fetcher S/R clustering with explicit signatures into the `fast_ta_aot`
+extension next to this file, so the bot starts without JIT compilation.
+When the extension is missing (dev checkouts, no compiler) each module
+falls back to @njit(cache=True) and warms its kernels up at import.
+
+Usage: python build_kernels.py
+"""
+
+import os
+import sys
+
+# Always build from the njit sources, never from a previously built extension
+sys.modules["fast_ta_aot"] = None
+
+from numba.pycc import CC  # noqa: E402
+
+import _kernels  # noqa: E402
+import data_fetcher  # noqa: E402
+import fast_ta  # noqa: E402
+
+cc = CC("fast_ta_aot")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# ── fast_ta recurrences ────────────────────────────────
+cc.export("ewm", "f8[:](f8[:], f8, i8)")(fast_ta.ewm.py_func)
+cc.export("ema", "f8[:](f8[:], i8)")(fast_ta.ema.py_func)
+cc.export("rsi", "f8[:](f8[:], i8)")(fast_ta.rsi.py_func)
+cc.export("rsi_averages", "UniTuple(f8, 2)(f8[:], i8)")(fast_ta.rsi_averages.py_func)
+cc.export("macd", "UniTuple(f8[:], 3)(f8[:], i8, i8, i8)")(fast_ta.macd.py_func)
+cc.export("macd_last", "UniTuple(f8, 3)(f8[:], i8, i8, i8)")(fast_ta.macd_last.py_func)
+cc.export("atr", "f8[:](f8[:], f8[:], f8[:], i8)")(fast_ta.atr.py_func)
+cc.export("atr_last", "f8(f8[:], f8[:], f8[:], i8)")(fast_ta.atr_last.py_func)
+cc.export("bbands", "UniTuple(f8[:], 3)(f8[:], i8, f8)")(fast_ta.bbands.py_func)
+cc.export("stoch", "UniTuple(f8[:], 2)(f8[:], i8, i8, i8)")(fast_ta.stoch.py_func)
+cc.export("adx", "UniTuple(f8[:], 3)(f8[:], f8[:], f8[:], i8)")(fast_ta.adx.py_func)
+cc.export("adx_last", "UniTuple(f8, 3)(f8[:], f8[:], f8[:], i8)")(fast_ta.adx_last.py_func)
+
+# ── Decision ladders: (direction, confidence, branch) ──
+cc.export("ema_cross_decide", "Tuple((i8, f8, i8))(f8, f8, f8, f8)")(
+    _kernels.ema_cross_decide.py_func)
+cc.export("rsi_decide", "Tuple((i8, f8, i8))(f8, f8, f8, f8)")(
+    _kernels.rsi_decide.py_func)
+cc.export("macd_decide", "Tuple((i8, f8, i8))(f8, f8, f8, f8, f8, f8)")(
+    _kernels.macd_decide.py_func)
+cc.export("bollinger_decide", "Tuple((i8, f8, i8))(f8, f8, f8, f8, f8, f8)")(
+    _kernels.bollinger_decide.py_func)
+cc.export("stochrsi_decide", "Tuple((i8, f8, i8))(f8, f8, f8, f8, f8, f8)")(
+    _kernels.stochrsi_decide.py_func)
+cc.export("adx_decide", "Tuple((i8, f8, i8))(f8, f8, f8, f8)")(
+    _kernels.adx_decide.py_func)
+
+# ── Support / resistance clustering ────────────────────
+cc.export("cluster_levels_nb", "Tuple((f8[:], i8[:]))(f8[:], f8)")(
+    data_fetcher.cluster_levels_nb.py_func)
+
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"✅ Built {cc.name} in {cc.output_dir}")
@@ -11,11 +11,28 @@ load_dotenv()
 # ── Telegram ────────────────────────────────────────────
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
+TELEGRAM_POOL_SIZE = 32           # Keep-alive connections for outgoing API calls
+TELEGRAM_POOL_TIMEOUT = 20        # Seconds to wait for a free pooled connection
+TELEGRAM_UPDATES_POOL_SIZE = 4    # Separate pool for getUpdates long polling
+TELEGRAM_MAX_RATE = 30            # Outgoing messages per second, all chats (Bot API limit)
+TELEGRAM_GROUP_MAX_RATE = 20      # Messages per minute into one group/channel
+TELEGRAM_MAX_RETRIES = 3          # RetryAfter responses retried after the advised wait
+TELEGRAM_COALESCE_SECONDS = 0.5   # Status/exit messages queued this close together go out as one
+TELEGRAM_MESSAGE_LIMIT = 4096     # Max characters in one Telegram message
 
 # ── Exchange (data source for signals) ──────────────────
 # binanceusdm = Binance USDT-M futures (not blocked on cloud servers)
 # bybit = Bybit (blocked on AWS/Render IPs)
 EXCHANGE_ID = os.getenv("EXCHANGE_ID", "binanceusdm")
+FETCH_CONCURRENCY = 10            # Max in-flight market-data requests
+FETCH_RATE_PER_SECOND = 20        # Market-data request starts per second (token bucket)
+PRICE_CACHE_TTL_SECONDS = 5       # Reuse a fetched last price for this long
+# Bybit only: pull klines from the raw v5 API instead of CCXT's unified wrapper
+BYBIT_RAW_KLINES = os.getenv("BYBIT_RAW_KLINES", "true").lower() == "true"
+# Stream candles over websockets instead of polling REST every scan
+USE_WEBSOCKET = os.getenv("USE_WEBSOCKET", "false").lower() == "true"
+# Mirror the Bybit wallet and positions from the private websocket (auto-trader only)
+TRADER_USE_WEBSOCKET = os.getenv("TRADER_USE_WEBSOCKET", "false").lower() == "true"
 
 # ── Bybit Trading API ─────────────────────────────────────
 BYBIT_API_KEY = os.getenv("BYBIT_API_KEY", "")
@@ -1,18 +1,314 @@
 """
-Data fetcher module — wraps CCXT to fetch OHLCV candle data from Binance.
+Data fetcher module — wraps async CCXT to fetch OHLCV candle data from Binance.
 """
 
-import ccxt
+import asyncio
+from collections import defaultdict
+import ccxt.async_support as ccxt
+import ccxt.pro as ccxtpro
+import httpx
+import numpy as np
+import orjson
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 import config
 import logging
+import time
+from dataclasses import dataclass, field
 from typing import Optional
+from numba_compat import load_aot, njit
 
 logger = logging.getLogger(__name__)
 
+# CCXT timeframe → Bybit v5 kline interval
+BYBIT_INTERVALS = {
+    "1m": "1", "3m": "3", "5m": "5", "15m": "15", "30m": "30",
+    "1h": "60", "2h": "120", "4h": "240", "6h": "360", "12h": "720",
+    "1d": "D", "1w": "W",
+}
+
+
+@njit(cache=True, nogil=True)
+def cluster_levels_nb(levels: np.ndarray, threshold_pct: float):
+    """
+    Group sorted price levels lying within threshold_pct of each cluster's first level.
+    Returns parallel arrays (average price, touch count) in ascending price order.
+    """
+    n = levels.shape[0]
+    avgs = np.empty(n, dtype=np.float64)
+    counts = np.empty(n, dtype=np.int64)
+    k = 0
+    start = levels[0]
+    total = levels[0]
+    count = 1
+
+    for i in range(1, n):
+        if (levels[i] - start) / start * 100 < threshold_pct:
+            total += levels[i]
+            count += 1
+        else:
+            avgs[k] = total / count
+            counts[k] = count
+            k += 1
+            start = levels[i]
+            total = levels[i]
+            count = 1
+
+    avgs[k] = total / count
+    counts[k] = count
+    return avgs[:k + 1], counts[:k + 1]
+
+
+_aot = load_aot("cluster_levels_nb")
+if _aot is not None:
+    # Prebuilt by build_kernels.py — no JIT compile at startup
+    cluster_levels_nb = _aot.cluster_levels_nb
+else:
+    # Compile at import so the first S/R pass doesn't pay for it
+    cluster_levels_nb(np.array([1.0, 1.001, 2.0]), 0.5)
+
+
+def _sorted_levels(levels: list[tuple[float, int]]) -> tuple[np.ndarray, np.ndarray]:
+    """(price, strength) tuples → parallel arrays in ascending price order."""
+    arr = np.array(levels, dtype=np.float64).reshape(-1, 2)
+    order = np.argsort(arr[:, 0], kind="stable")
+    return arr[order, 0], arr[order, 1].astype(np.int64)
+
+
+@dataclass
+class OHLCV:
+    """Candle data as parallel numpy arrays (oldest first)."""
+    ts: np.ndarray          # int64 epoch-ms
+    open: np.ndarray        # float64
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    key: Optional[str] = field(default=None, compare=False)  # "<symbol>_<timeframe>"
+
+    COLUMNS = ("ts", "open", "high", "low", "close", "volume")
+
+    @classmethod
+    def from_rows(cls, rows) -> "OHLCV":
+        """Build from [timestamp, open, high, low, close, volume] rows in one pass."""
+        cols = np.asarray(rows, dtype=np.float64)[:, :6].T.copy()
+        return cls(
+            ts=cols[0].astype(np.int64),
+            open=cols[1], high=cols[2], low=cols[3], close=cols[4], volume=cols[5],
+        )
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def merge(self, newer: "OHLCV", limit: int) -> "OHLCV":
+        """Splice newer bars onto this series (newer wins on overlap), keeping the last `limit`."""
+        keep = int(np.searchsorted(self.ts, newer.ts[0]))
+        return OHLCV(*(
+            np.concatenate((getattr(self, col)[:keep], getattr(newer, col)))[-limit:]
+            for col in self.COLUMNS
+        ), key=self.key)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        DataFrame view (DatetimeIndex + OHLCV columns) for pandas-based consumers.
+        Columns wrap the float64 arrays without copying; the index is built in one pass.
+        """
+        return pd.DataFrame(
+            {
+                "open": self.open,
+                "high": self.high,
+                "low": self.low,
+                "close": self.close,
+                "volume": self.volume,
+            },
+            index=pd.DatetimeIndex(self.ts.astype("datetime64[ms]"), name="timestamp"),
+            copy=False,
+        )
+
+
+class CandleRing:
+    """Preallocated ring buffer of candles in the OHLCV column layout."""
+
+    def __init__(self, capacity: int):
+        self._buf = np.empty((6, capacity), dtype=np.float64)  # ts, o, h, l, c, v
+        self._capacity = capacity
+        self._head = 0      # next write slot
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_ts(self) -> int:
+        return int(self._buf[0, self._head - 1])
+
+    def load(self, data: OHLCV):
+        """Seed the ring from a REST snapshot."""
+        n = min(len(data), self._capacity)
+        for row, col in enumerate(OHLCV.COLUMNS):
+            self._buf[row, :n] = getattr(data, col)[-n:]
+        self._head = n % self._capacity
+        self._size = n
+
+    def push(self, candle: list):
+        """Append a new bar, or overwrite the newest one while it is still forming."""
+        if self._size and candle[0] < self.last_ts:
+            return
+        if not self._size or candle[0] > self.last_ts:
+            self._head = (self._head + 1) % self._capacity
+            self._size = min(self._size + 1, self._capacity)
+        self._buf[:, self._head - 1] = candle[:6]
+
+    def snapshot(self) -> OHLCV:
+        """Copy out the buffer in chronological order."""
+        if self._size < self._capacity:
+            cols = self._buf[:, :self._size].copy()
+        else:
+            cols = np.concatenate((self._buf[:, self._head:], self._buf[:, :self._head]), axis=1)
+        return OHLCV(
+            ts=cols[0].astype(np.int64),
+            open=cols[1], high=cols[2], low=cols[3], close=cols[4], volume=cols[5],
+        )
+
+
+class RateLimiter:
+    """
+    Async gate for REST calls: at most `concurrency` requests in flight, and
+    request starts paced by a token bucket refilled at `rate` per second
+    (bursts of up to `rate`). Used as `async with limiter:`.
+    The in-flight cap is a Condition-guarded counter, so set_concurrency()
+    can resize it at runtime.
+    """
+
+    def __init__(self, concurrency: int, rate: float):
+        self._slots = asyncio.Condition()
+        self._active = 0
+        self._max_active = concurrency
+        self._rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        # Waiters queue here in arrival order instead of all polling the bucket
+        self._lock = asyncio.Lock()
+
+    async def set_concurrency(self, concurrency: int):
+        """Change the in-flight cap; waiters re-check it immediately."""
+        async with self._slots:
+            self._max_active = concurrency
+            self._slots.notify_all()
+
+    async def _take_token(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._rate, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    async def _release(self):
+        async with self._slots:
+            self._active -= 1
+            self._slots.notify(1)
+
+    async def __aenter__(self):
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._active < self._max_active)
+            self._active += 1
+        try:
+            await self._take_token()
+        except BaseException:
+            await self._release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._release()
+
+
+class BybitRawFetcher:
+    """
+    Fetches klines and OI history straight from Bybit's public v5 REST API.
+    Skips CCXT's unified parsing and reuses one HTTP/2 connection for all symbols.
+    """
+
+    BASE_URL = "https://api.bybit.com"
+
+    def __init__(self):
+        self.client = httpx.AsyncClient(
+            base_url=self.BASE_URL,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20),
+            timeout=10.0,
+        )
+        # "BTC/USDT:USDT" → "BTCUSDT"; replaced by exchange market ids once markets load
+        self._symbol_ids = {
+            s: s.split(":")[0].replace("/", "") for s in config.TRADING_PAIRS
+        }
+
+    def set_market_ids(self, market_ids: dict[str, str]):
+        """Use market ids resolved from the exchange's loaded markets."""
+        self._symbol_ids.update(market_ids)
+
+    def market_id(self, symbol: str) -> str:
+        """Map a CCXT unified symbol to a Bybit market id."""
+        market_id = self._symbol_ids.get(symbol)
+        if market_id is None:
+            market_id = self._symbol_ids[symbol] = symbol.split(":")[0].replace("/", "")
+        return market_id
+
+    async def _get(self, path: str, params: dict) -> dict:
+        """GET a v5 endpoint and return its `result` object."""
+        resp = await self.client.get(path, params=params)
+        resp.raise_for_status()
+        payload = orjson.loads(resp.content)
+        if payload.get("retCode") != 0:
+            raise ccxt.ExchangeError(f"Bybit {path} error: {payload.get('retMsg')}")
+        return payload["result"]
+
+    async def fetch_kline(self, symbol: str, timeframe: str, limit: int) -> np.ndarray:
+        """
+        Fetch klines as a float64 array of rows:
+            timestamp, open, high, low, close, volume (oldest first)
+        """
+        result = await self._get("/v5/market/kline", {
+            "category": "linear",
+            "symbol": self.market_id(symbol),
+            "interval": BYBIT_INTERVALS[timeframe],
+            "limit": limit,
+        })
+
+        rows = result["list"]
+        if not rows:
+            return np.empty((0, 6), dtype=np.float64)
+        # Bybit returns newest first; the extra turnover column is dropped
+        return np.asarray(rows, dtype=np.float64)[::-1, :6]
+
+    async def fetch_oi_history(
+        self, symbol: str, interval: str = "5min", limit: int = 30
+    ) -> np.ndarray:
+        """Fetch open interest (base coin) as a float64 array, oldest first."""
+        result = await self._get("/v5/market/open-interest", {
+            "category": "linear",
+            "symbol": self.market_id(symbol),
+            "intervalTime": interval,
+            "limit": limit,
+        })
+        rows = result["list"]
+        values = np.fromiter(
+            (float(row["openInterest"]) for row in rows),
+            dtype=np.float64, count=len(rows),
+        )
+        return values[::-1]
+
+    async def close(self):
+        """Close the HTTP/2 connection pool."""
+        await self.client.aclose()
+
 
 class DataFetcher:
-    """Fetches OHLCV data from Binance Futures via CCXT."""
+    """Fetches OHLCV data from Binance Futures via async CCXT."""
 
     def __init__(self):
         exchange_class = getattr(ccxt, config.EXCHANGE_ID)
@@ -22,45 +318,124 @@ class DataFetcher:
                 "defaultType": "future",
             },
         })
-        self._cache: dict[str, pd.DataFrame] = {}
+        self._cache: dict[str, object] = {}
+        # One lock per cache key: concurrent misses on the same key share one request
+        self._locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # Candle history survives scan cycles; only bars newer than the last fetch are pulled
+        self._candles: dict[str, OHLCV] = {}
+        # Shared by every REST call: caps in-flight requests and paces them to the
+        # exchange quota (the raw Bybit client bypasses CCXT's own throttle)
+        self._limiter = RateLimiter(config.FETCH_CONCURRENCY, config.FETCH_RATE_PER_SECOND)
+        # Batched ticker snapshot shared by the exit checks
+        self._prices: dict[str, float] = {}
+        self._prices_at = float("-inf")
+        # Per-symbol last prices: symbol -> (monotonic fetch time, price)
+        self._price_cache: dict[str, tuple[float, float]] = {}
+        self._market_ids: dict[str, str] = {}
+        self._raw: Optional[BybitRawFetcher] = None
+        if config.EXCHANGE_ID == "bybit" and config.BYBIT_RAW_KLINES:
+            self._raw = BybitRawFetcher()
         logger.info(f"DataFetcher initialized for {config.EXCHANGE_ID} futures")
 
-    def fetch_ohlcv(
+    @classmethod
+    async def create(cls) -> "DataFetcher":
+        """Build a fetcher and load exchange markets once up front."""
+        fetcher = cls()
+        markets = await fetcher.exchange.load_markets()
+        # Resolve exchange market ids once; the raw fetcher maps symbols by dict lookup
+        fetcher._market_ids = {
+            s: fetcher.exchange.market(s)["id"] for s in config.TRADING_PAIRS if s in markets
+        }
+        if fetcher._raw:
+            fetcher._raw.set_market_ids(fetcher._market_ids)
+        return fetcher
+
+    async def close(self):
+        """Close the underlying exchange HTTP sessions."""
+        await self.exchange.close()
+        if self._raw:
+            await self._raw.close()
+
+    async def fetch_all(self, symbols: list[str], timeframes: list[str]):
+        """
+        Fetch OHLCV for every symbol/timeframe plus funding and OI concurrently.
+        Results land in the cache, so later per-symbol calls are cache hits.
+        """
+        tasks = [self.fetch_ohlcv(s, tf) for s in symbols for tf in timeframes]
+        tasks.append(self.fetch_all_funding(symbols))
+        tasks += [self.fetch_open_interest(s) for s in symbols]
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def fetch_ohlcv(
         self,
         symbol: str,
         timeframe: str,
         limit: int = config.CANDLE_LIMIT,
-    ) -> Optional[pd.DataFrame]:
+    ) -> Optional[OHLCV]:
         """
         Fetch OHLCV candles for a symbol/timeframe.
-        Returns a pandas DataFrame with columns:
-            timestamp, open, high, low, close, volume
+        Returns an OHLCV container of numpy arrays:
+            ts, open, high, low, close, volume
         Uses in-memory cache to avoid redundant calls within the same scan cycle.
+        Across cycles only the bars opened since the previous fetch (plus the
+        still-forming one) are downloaded and spliced onto the stored history.
         """
         cache_key = f"{symbol}_{timeframe}"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        return await self._cached(
+            cache_key, lambda: self._load_ohlcv(cache_key, symbol, timeframe, limit)
+        )
 
+    async def _cached(self, cache_key: str, loader) -> Optional[object]:
+        """
+        Serve `cache_key` from the per-cycle cache, otherwise await `loader()`
+        and store a non-None result. Concurrent callers for the same key wait
+        on its lock and then read the value the first caller stored.
+        """
+        value = self._cache.get(cache_key)
+        if value is not None:
+            return value
+        async with self._locks[cache_key]:
+            value = self._cache.get(cache_key)
+            if value is None:
+                value = await loader()
+                if value is not None:
+                    self._cache[cache_key] = value
+        return value
+
+    async def _load_ohlcv(
+        self, cache_key: str, symbol: str, timeframe: str, limit: int
+    ) -> Optional[OHLCV]:
+        """Download (new) candles and splice them onto the stored history."""
         try:
-            raw = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
-            if not raw:
+            prev = self._candles.get(cache_key)
+            fetch_limit = limit
+            if prev is not None and len(prev) >= limit:
+                tf_ms = self.exchange.parse_timeframe(timeframe) * 1000
+                current_bar = self.exchange.milliseconds() // tf_ms * tf_ms
+                new_bars = (current_bar - int(prev.ts[-1])) // tf_ms
+                fetch_limit = min(max(new_bars + 1, 2), limit)
+
+            async with self._limiter:
+                if self._raw:
+                    raw = await self._raw.fetch_kline(symbol, timeframe, fetch_limit)
+                else:
+                    raw = await self.exchange.fetch_ohlcv(symbol, timeframe, limit=fetch_limit)
+            if len(raw) == 0:
                 logger.warning(f"No data returned for {symbol} {timeframe}")
                 return None
 
-            df = pd.DataFrame(
-                raw,
-                columns=["timestamp", "open", "high", "low", "close", "volume"],
-            )
-            df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-            df.set_index("timestamp", inplace=True)
-
-            # Ensure numeric types
-            for col in ["open", "high", "low", "close", "volume"]:
-                df[col] = df[col].astype(float)
+            data = OHLCV.from_rows(raw)
+            data.key = cache_key
+            if fetch_limit < limit:
+                if data.ts[0] > prev.ts[-1]:
+                    # Gap between stored history and the fresh bars — refetch in full
+                    self._candles.pop(cache_key, None)
+                    return await self._load_ohlcv(cache_key, symbol, timeframe, limit)
+                data = prev.merge(data, limit)
 
-            self._cache[cache_key] = df
-            logger.debug(f"Fetched {len(df)} candles for {symbol} {timeframe}")
-            return df
+            self._candles[cache_key] = data
+            logger.debug(f"Fetched {len(raw)} candles for {symbol} {timeframe}")
+            return data
 
         except ccxt.NetworkError as e:
             logger.error(f"Network error fetching {symbol}: {e}")
@@ -73,38 +448,103 @@ class DataFetcher:
             return None
 
     def clear_cache(self):
-        """Clear the data cache (call at the start of each scan cycle)."""
+        """
+        Clear the per-cycle cache (call at the start of each scan cycle).
+        Stored candle history is kept and topped up incrementally.
+        """
         self._cache.clear()
 
-    def get_current_price(self, symbol: str) -> Optional[float]:
-        """Get the current price for a symbol."""
+    async def get_current_price(self, symbol: str) -> Optional[float]:
+        """
+        Get the current price for a symbol.
+        A price fetched less than PRICE_CACHE_TTL_SECONDS ago (here or by
+        fetch_all_prices) is returned without another request.
+        """
+        now = time.monotonic()
+        cached = self._price_cache.get(symbol)
+        if cached is not None and now - cached[0] < config.PRICE_CACHE_TTL_SECONDS:
+            return cached[1]
+
         try:
-            ticker = self.exchange.fetch_ticker(symbol)
-            return float(ticker["last"])
+            async with self._limiter:
+                ticker = await self.exchange.fetch_ticker(symbol)
+            price = float(ticker["last"])
         except Exception as e:
             logger.error(f"Error fetching price for {symbol}: {e}")
             return None
 
-    def fetch_funding_rate(self, symbol: str) -> Optional[dict]:
+        self._price_cache[symbol] = (now, price)
+        return price
+
+    async def fetch_all_prices(self, symbols: list[str]) -> dict[str, float]:
+        """
+        Last prices for several symbols in one fetch_tickers round trip.
+        Reused only for PRICE_CACHE_TTL_SECONDS, so every exit check sees fresh prices.
+        """
+        now = time.monotonic()
+        if (now - self._prices_at < config.PRICE_CACHE_TTL_SECONDS
+                and all(s in self._prices for s in symbols)):
+            return {s: self._prices[s] for s in symbols}
+
+        try:
+            async with self._limiter:
+                tickers = await self.exchange.fetch_tickers(symbols)
+        except Exception as e:
+            logger.error(f"Error fetching prices for {len(symbols)} symbols: {e}")
+            return {}
+
+        self._prices = {
+            sym: float(t["last"]) for sym, t in tickers.items()
+            if t.get("last") is not None
+        }
+        self._prices_at = now
+        self._price_cache.update((sym, (now, price)) for sym, price in self._prices.items())
+        return {s: self._prices[s] for s in symbols if s in self._prices}
+
+    async def fetch_funding_rate(self, symbol: str) -> Optional[dict]:
         """
         Fetch current funding rate for a futures symbol via CCXT (Bybit).
         """
-        cache_key = f"{symbol}_funding"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        return await self._cached(f"{symbol}_funding", lambda: self._load_funding(symbol))
+
+    async def fetch_all_funding(self, symbols: list[str]) -> dict[str, dict]:
+        """
+        Fetch funding for many symbols in one fetch_funding_rates call and
+        store each in the cache, so fetch_funding_rate() becomes a cache hit.
+        Symbols missing from the batch fall back to per-symbol requests.
+        """
+        try:
+            async with self._limiter:
+                rates = await self.exchange.fetch_funding_rates(symbols)
+        except Exception as e:
+            logger.warning(f"Batch funding fetch failed, falling back per symbol: {e}")
+            return {}
+
+        results = {}
+        for symbol, funding in rates.items():
+            result = self._parse_funding(funding)
+            self._cache[f"{symbol}_funding"] = result
+            results[symbol] = result
+        logger.debug(f"Funding rates fetched for {len(results)} symbols")
+        return results
+
+    @staticmethod
+    def _parse_funding(funding: dict) -> dict:
+        return {
+            "funding_rate": float(funding.get("fundingRate", 0) or 0),
+            "mark_price": float(funding.get("markPrice", 0) or 0),
+            "index_price": float(funding.get("indexPrice", 0) or 0),
+            "next_funding_time": int(funding.get("fundingTimestamp", 0) or 0),
+        }
 
+    async def _load_funding(self, symbol: str) -> Optional[dict]:
         try:
             # CCXT unified method — works with Bybit and most exchanges
-            funding = self.exchange.fetch_funding_rate(symbol)
+            async with self._limiter:
+                funding = await self.exchange.fetch_funding_rate(symbol)
 
-            result = {
-                "funding_rate": float(funding.get("fundingRate", 0) or 0),
-                "mark_price": float(funding.get("markPrice", 0) or 0),
-                "index_price": float(funding.get("indexPrice", 0) or 0),
-                "next_funding_time": int(funding.get("fundingTimestamp", 0) or 0),
-            }
+            result = self._parse_funding(funding)
 
-            self._cache[cache_key] = result
             logger.debug(f"Funding rate for {symbol}: {result['funding_rate']:.6f}")
             return result
 
@@ -112,40 +552,44 @@ class DataFetcher:
             logger.error(f"Error fetching funding rate for {symbol}: {e}")
             return None
 
-    def fetch_open_interest(self, symbol: str) -> Optional[dict]:
+    async def fetch_open_interest(self, symbol: str) -> Optional[dict]:
         """
         Fetch open interest for a futures symbol via CCXT (Bybit).
         """
-        cache_key = f"{symbol}_oi"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        return await self._cached(f"{symbol}_oi", lambda: self._load_open_interest(symbol))
 
+    async def _load_open_interest(self, symbol: str) -> Optional[dict]:
         try:
             # CCXT unified method for open interest
-            oi = self.exchange.fetch_open_interest(symbol)
+            async with self._limiter:
+                oi = await self.exchange.fetch_open_interest(symbol)
             oi_coins = float(oi.get("openInterestAmount", 0) or 0)
 
             # Try to get OI history for trend analysis
-            oi_values = []
+            oi_values = np.empty(0, dtype=np.float64)
             try:
-                oi_history = self.exchange.fetch_open_interest_history(
-                    symbol, timeframe="5m", limit=30
-                )
-                oi_values = [
-                    float(h.get("openInterestValue", 0) or h.get("openInterestAmount", 0) or 0)
-                    for h in oi_history
-                ]
+                async with self._limiter:
+                    if self._raw is not None:
+                        oi_values = await self._raw.fetch_oi_history(symbol)
+                    else:
+                        oi_history = await self.exchange.fetch_open_interest_history(
+                            symbol, timeframe="5m", limit=30
+                        )
+                        oi_values = np.fromiter(
+                            (float(h.get("openInterestValue", 0) or h.get("openInterestAmount", 0) or 0)
+                             for h in oi_history),
+                            dtype=np.float64, count=len(oi_history),
+                        )
             except Exception:
                 # OI history not available — use single point
                 if oi_coins > 0:
-                    oi_values = [oi_coins]
+                    oi_values = np.array([oi_coins])
 
             result = {
                 "open_interest": oi_coins,
                 "oi_values": oi_values,
             }
 
-            self._cache[cache_key] = result
             logger.debug(f"OI for {symbol}: {oi_coins}")
             return result
 
@@ -154,50 +598,38 @@ class DataFetcher:
             return None
 
     def find_support_resistance(
-        self, df: pd.DataFrame, window: int = 20, num_levels: int = 5
+        self, data: OHLCV, window: int = 20, num_levels: int = 5
     ) -> dict:
         """
         Detect support and resistance levels from price data using pivot points.
-        Returns dict with 'support' and 'resistance' lists of (price, strength) tuples.
+        Returns dict with 'support' and 'resistance' lists of (price, strength) tuples,
+        plus the same levels as price-sorted arrays ('support_sorted' /
+        'support_strength', 'resistance_sorted' / 'resistance_strength').
         """
-        highs = df["high"].values
-        lows = df["low"].values
-        closes = df["close"].values
-
-        resistance_levels = []
-        support_levels = []
-
-        # Find pivot highs and lows
-        for i in range(window, len(df) - window):
-            # Pivot high — local maximum
-            if highs[i] == max(highs[i - window:i + window + 1]):
-                resistance_levels.append(float(highs[i]))
-            # Pivot low — local minimum
-            if lows[i] == min(lows[i - window:i + window + 1]):
-                support_levels.append(float(lows[i]))
+        highs = data.high
+        lows = data.low
+        closes = data.close
+
+        # Find pivot highs and lows — bar equals the max/min of its centred window
+        span = 2 * window + 1
+        if len(data) >= span:
+            centre = slice(window, len(data) - window)
+            is_pivot_high = highs[centre] == sliding_window_view(highs, span).max(axis=1)
+            is_pivot_low = lows[centre] == sliding_window_view(lows, span).min(axis=1)
+            resistance_levels = highs[centre][is_pivot_high]
+            support_levels = lows[centre][is_pivot_low]
+        else:
+            resistance_levels = support_levels = np.empty(0)
 
         # Cluster nearby levels (within 0.5% of each other)
-        def cluster_levels(levels: list[float], threshold_pct: float = 0.5) -> list[tuple[float, int]]:
-            if not levels:
+        def cluster_levels(levels: np.ndarray, threshold_pct: float = 0.5) -> list[tuple[float, int]]:
+            if levels.size == 0:
                 return []
-            levels.sort()
-            clusters = []
-            current_cluster = [levels[0]]
+            avgs, counts = cluster_levels_nb(np.sort(levels), threshold_pct)
 
-            for i in range(1, len(levels)):
-                if (levels[i] - current_cluster[0]) / current_cluster[0] * 100 < threshold_pct:
-                    current_cluster.append(levels[i])
-                else:
-                    avg = sum(current_cluster) / len(current_cluster)
-                    clusters.append((round(avg, 6), len(current_cluster)))
-                    current_cluster = [levels[i]]
-
-            avg = sum(current_cluster) / len(current_cluster)
-            clusters.append((round(avg, 6), len(current_cluster)))
-
-            # Sort by strength (number of touches) descending
-            clusters.sort(key=lambda x: x[1], reverse=True)
-            return clusters[:num_levels]
+            # Strongest (most touches) first; only the kept clusters become tuples
+            top = np.argsort(-counts, kind="stable")[:num_levels]
+            return [(round(float(avgs[i]), 6), int(counts[i])) for i in top]
 
         current_price = float(closes[-1])
 
@@ -209,9 +641,103 @@ class DataFetcher:
         supports = [(p, s) for p, s in all_supports if p < current_price]
         resistances = [(p, s) for p, s in all_resistances if p > current_price]
 
+        support_sorted, support_strength = _sorted_levels(supports)
+        resistance_sorted, resistance_strength = _sorted_levels(resistances)
+
         return {
             "support": supports,
             "resistance": resistances,
+            "support_sorted": support_sorted,
+            "support_strength": support_strength,
+            "resistance_sorted": resistance_sorted,
+            "resistance_strength": resistance_strength,
             "current_price": current_price,
         }
 
+
+class WSDataFetcher(DataFetcher):
+    """
+    DataFetcher that keeps candles current over websockets (CCXT Pro).
+    Each (symbol, timeframe) is seeded once via REST, then updated by its own
+    watch task — scans read the in-memory rings with no network round-trip.
+    """
+
+    def __init__(self):
+        super().__init__()
+        exchange_class = getattr(ccxtpro, config.EXCHANGE_ID)
+        self.ws_exchange = exchange_class({
+            "enableRateLimit": True,
+            "options": {
+                "defaultType": "future",
+            },
+        })
+        self._rings: dict[str, CandleRing] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    @classmethod
+    async def create(cls) -> "WSDataFetcher":
+        """Build a fetcher, load markets and start the candle streams."""
+        fetcher = await super().create()
+        await fetcher.start(
+            config.TRADING_PAIRS,
+            [config.PRIMARY_TIMEFRAME, config.CONFIRMATION_TIMEFRAME],
+        )
+        return fetcher
+
+    async def start(self, symbols: list[str], timeframes: list[str]):
+        """Seed every ring via REST, then spawn one watch task per stream."""
+        pairs = [(s, tf) for s in symbols for tf in timeframes]
+        await asyncio.gather(*(self._seed(s, tf) for s, tf in pairs))
+        # Independent tasks rather than watch_ohlcv_for_symbols — one slow
+        # stream must not hold back the others
+        self._tasks = [
+            asyncio.create_task(self._watch(s, tf))
+            for s, tf in pairs if f"{s}_{tf}" in self._rings
+        ]
+        logger.info(f"📡 Streaming candles for {len(self._tasks)} symbol/timeframe pairs")
+
+    async def _seed(self, symbol: str, timeframe: str):
+        data = await super().fetch_ohlcv(symbol, timeframe)
+        if data is None:
+            return
+        ring = CandleRing(config.CANDLE_LIMIT)
+        ring.load(data)
+        self._rings[f"{symbol}_{timeframe}"] = ring
+
+    async def _watch(self, symbol: str, timeframe: str):
+        ring = self._rings[f"{symbol}_{timeframe}"]
+        while True:
+            try:
+                candles = await self.ws_exchange.watch_ohlcv(symbol, timeframe)
+                for candle in candles:
+                    # The update can carry the just-closed bar as well as the new one
+                    if candle[0] >= ring.last_ts:
+                        ring.push(candle)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Candle stream error for {symbol} {timeframe}: {e}")
+                await asyncio.sleep(5)
+
+    async def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int = config.CANDLE_LIMIT,
+    ) -> Optional[OHLCV]:
+        """Serve candles from the streamed ring; fall back to REST for unknown streams."""
+        key = f"{symbol}_{timeframe}"
+        ring = self._rings.get(key)
+        if ring is None or len(ring) == 0:
+            return await super().fetch_ohlcv(symbol, timeframe, limit)
+        data = ring.snapshot()
+        data.key = key
+        return data
+
+    async def close(self):
+        """Stop the candle streams and close all exchange sessions."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.ws_exchange.close()
+        await super().close()
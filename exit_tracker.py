@@ -8,57 +8,151 @@ Tracks each signal from entry, notifies when:
 """
 
 import logging
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 from typing import Optional
-from enum import Enum
+from enum import IntEnum
 
-import config
+import numpy as np
 
-logger = logging.getLogger(__name__)
+from config import EXIT_TIME_HOURS, TP_PARTIAL_PCT
 
+logger = logging.getLogger(__name__)
 
-class ExitReason(Enum):
-    STOP_LOSS = "🛑 STOP LOSS"
-    TAKE_PROFIT_1 = "🎯 TAKE PROFIT 1 (Partial)"
-    TAKE_PROFIT_2 = "🎯🎯 TAKE PROFIT 2 (Full)"
-    TIME_EXIT = "⏰ ВИХІД ПО ЧАСУ"
-    MANUAL = "✋ Manual"
 
+class ExitReason(IntEnum):
+    STOP_LOSS = 0
+    TAKE_PROFIT_1 = 1
+    TAKE_PROFIT_2 = 2
+    TIME_EXIT = 3
+    MANUAL = 4
 
-class PositionStatus(Enum):
-    OPEN = "open"
-    TP1_HIT = "tp1_hit"       # Partial TP taken, trailing rest
-    CLOSED = "closed"
+    @property
+    def label(self) -> str:
+        """Human-readable label used in alerts and the marathon log."""
+        return _REASON_LABELS[self]
+
+
+_REASON_LABELS: dict[ExitReason, str] = {
+    ExitReason.STOP_LOSS: "🛑 STOP LOSS",
+    ExitReason.TAKE_PROFIT_1: "🎯 TAKE PROFIT 1 (Partial)",
+    ExitReason.TAKE_PROFIT_2: "🎯🎯 TAKE PROFIT 2 (Full)",
+    ExitReason.TIME_EXIT: "⏰ ВИХІД ПО ЧАСУ",
+    ExitReason.MANUAL: "✋ Manual",
+}
+
+
+class PositionStatus(IntEnum):
+    OPEN = 0
+    TP1_HIT = 1       # Partial TP taken, trailing rest
+    CLOSED = 2
+
+
+_EXIT_TIME_MS = int(EXIT_TIME_HOURS * 3_600_000)
+
+
+def _to_ms(dt: datetime) -> int:
+    return int(dt.timestamp() * 1000)
+
+
+def _age_hours(pos: "TrackedPosition", now: datetime) -> float:
+    """Hours since entry, measured against a caller-supplied clock."""
+    return (now - pos.opened_at).total_seconds() / 3600
+
+
+# ── Alert templates (static scaffold built once, filled per alert) ──
+_SEP = "━" * 30
+
+_CLOSE_TMPL = (
+    f"{_SEP}\n"
+    "{reason}\n"
+    f"{_SEP}\n"
+    "\n"
+    "📊 *{symbol}* — {direction}\n"
+    "📍 Entry: `{entry:,.2f}`\n"
+    "📍 Exit:  `{exit:,.2f}`\n"
+    "\n"
+    "{pnl_emoji} *PnL:* `{pnl:+.2f}%`\n"
+    "💰 Розмір: {size}% депозиту\n"
+    "⏱ Тривалість: {age:.1f}h\n"
+    "\n"
+    "🕐 {closed_at:%Y-%m-%d %H:%M UTC}\n"
+    f"{_SEP}"
+)
+
+_PARTIAL_TP_TMPL = (
+    f"{_SEP}\n"
+    f"{ExitReason.TAKE_PROFIT_1.label}\n"
+    f"{_SEP}\n"
+    "\n"
+    "📊 *{symbol}* — {direction}\n"
+    "📍 Entry: `{entry:,.2f}`\n"
+    "📍 TP1:   `{price:,.2f}`\n"
+    "\n"
+    "✅ *PnL:* `{pnl:+.2f}%`\n"
+    f"💡 Закрийте {TP_PARTIAL_PCT}% позиції!\n"
+    "🔒 SL переміщено → беззбитковість (`{entry:,.2f}`)\n"
+    "🎯 Чекаємо TP2: `{tp2:,.2f}`\n"
+    "\n"
+    "🕐 {now:%H:%M UTC}\n"
+    f"{_SEP}"
+)
 
 
-@dataclass
 class TrackedPosition:
     """A signal being tracked for exit conditions."""
-    symbol: str
-    direction: str                    # "LONG" or "SHORT"
-    entry_price: float
-    stop_loss: float
-    take_profit_1: float              # Partial TP (ATR * 1.5)
-    take_profit_2: float              # Full TP (ATR * 3.0)
-    score: int
-    position_size_pct: float          # % of deposit
-    opened_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    status: PositionStatus = PositionStatus.OPEN
-    exit_reason: Optional[ExitReason] = None
-    exit_price: Optional[float] = None
-    closed_at: Optional[datetime] = None
+
+    __slots__ = (
+        "symbol", "direction", "entry_price", "stop_loss",
+        "take_profit_1", "take_profit_2", "score", "position_size_pct",
+        "opened_at", "status", "exit_reason", "exit_price", "closed_at",
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        direction: str,                   # "LONG" or "SHORT"
+        entry_price: float,
+        stop_loss: float,
+        take_profit_1: float,             # Partial TP (ATR * 1.5)
+        take_profit_2: float,             # Full TP (ATR * 3.0)
+        score: int,
+        position_size_pct: float,         # % of deposit
+        opened_at: Optional[datetime] = None,
+        status: PositionStatus = PositionStatus.OPEN,
+        exit_reason: Optional[ExitReason] = None,
+        exit_price: Optional[float] = None,
+        closed_at: Optional[datetime] = None,
+    ):
+        self.symbol = symbol
+        self.direction = direction
+        self.entry_price = entry_price
+        self.stop_loss = stop_loss
+        self.take_profit_1 = take_profit_1
+        self.take_profit_2 = take_profit_2
+        self.score = score
+        self.position_size_pct = position_size_pct
+        self.opened_at = opened_at if opened_at is not None else datetime.now(timezone.utc)
+        self.status = status
+        self.exit_reason = exit_reason
+        self.exit_price = exit_price
+        self.closed_at = closed_at
+
+    def __repr__(self) -> str:
+        return (
+            f"TrackedPosition({self.symbol} {self.direction} "
+            f"@ {self.entry_price} | {self.status.name})"
+        )
 
     @property
     def age_hours(self) -> float:
         """How many hours since entry."""
-        delta = datetime.now(timezone.utc) - self.opened_at
-        return delta.total_seconds() / 3600
+        return _age_hours(self, datetime.now(timezone.utc))
 
     @property
     def is_expired(self) -> bool:
         """Whether the position exceeded the time limit."""
-        return self.age_hours >= config.EXIT_TIME_HOURS
+        return self.age_hours >= EXIT_TIME_HOURS
 
     @property
     def pnl_pct(self) -> Optional[float]:
@@ -90,13 +184,42 @@ class ExitTracker:
         self._positions: dict[str, TrackedPosition] = {}  # symbol → position
         self._history: list[TrackedPosition] = []          # closed positions
 
+        # ── SoA view of open positions (row i ↔ self._rows[i]) ──
+        self._rows: list[TrackedPosition] = []
+        # Triggers are pre-multiplied by the direction sign so one compare
+        # per level works for both sides: sign * price <= sign * SL, etc.
+        self._entry = np.empty(0)
+        self._dir_sign = np.empty(0)                       # +1 LONG / -1 SHORT
+        self._sl_signed = np.empty(0)
+        self._tp1_signed = np.empty(0)
+        self._tp2_signed = np.empty(0)
+        self._tp1_open = np.empty(0, dtype=bool)           # TP1 still pending
+        self._opened_ms = np.empty(0, dtype=np.int64)
+
+    def _rebuild_arrays(self):
+        """Re-pack the open positions into the parallel arrays."""
+        rows = self.open_positions
+        self._rows = rows
+        self._entry = np.array([p.entry_price for p in rows], dtype=np.float64)
+        self._dir_sign = sign = np.array(
+            [1.0 if p.direction == "LONG" else -1.0 for p in rows], dtype=np.float64
+        )
+        self._sl_signed = sign * np.array([p.stop_loss for p in rows], dtype=np.float64)
+        self._tp1_signed = sign * np.array([p.take_profit_1 for p in rows], dtype=np.float64)
+        self._tp2_signed = sign * np.array([p.take_profit_2 for p in rows], dtype=np.float64)
+        self._tp1_open = np.array(
+            [p.status == PositionStatus.OPEN for p in rows], dtype=bool
+        )
+        self._opened_ms = np.array([_to_ms(p.opened_at) for p in rows], dtype=np.int64)
+
     @property
     def open_positions(self) -> list[TrackedPosition]:
         return [p for p in self._positions.values() if p.status != PositionStatus.CLOSED]
 
     @property
     def position_count(self) -> int:
-        return len(self.open_positions)
+        # _rows mirrors the open positions, so no filtered list is built per call
+        return len(self._rows)
 
     def add_position(self, position: TrackedPosition):
         """Start tracking a new position."""
@@ -111,104 +234,82 @@ class ExitTracker:
                 self._history.append(old)
 
         self._positions[position.symbol] = position
+        self._rebuild_arrays()
         logger.info(
             f"📌 Tracking {position.symbol} {position.direction} "
             f"@ {position.entry_price:.2f} | SL={position.stop_loss:.2f} | "
             f"TP1={position.take_profit_1:.2f} | TP2={position.take_profit_2:.2f} | "
             f"Size={position.position_size_pct}% | "
-            f"Exit in {config.EXIT_TIME_HOURS}h"
+            f"Exit in {EXIT_TIME_HOURS}h"
         )
 
-    def check_exits(self, price_getter) -> list[ExitAlert]:
+    def check_exits(self, prices: dict[str, float]) -> list[ExitAlert]:
         """
         Check all open positions for exit conditions.
-        price_getter: callable(symbol) → float or None
+        prices: symbol → last price (symbols without a price are skipped)
         Returns list of ExitAlerts for positions that should be closed.
         """
-        alerts = []
+        rows = self._rows
+        if not rows:
+            return []
 
-        for symbol, pos in list(self._positions.items()):
-            if pos.status == PositionStatus.CLOSED:
-                continue
-
-            current_price = price_getter(symbol)
-            if current_price is None:
-                continue
-
-            pnl = pos.calc_pnl_pct(current_price)
-
-            # ── Check Stop Loss ──────────────────────────
-            if pos.direction == "LONG" and current_price <= pos.stop_loss:
-                alert = self._close_position(pos, ExitReason.STOP_LOSS, current_price, pnl)
-                alerts.append(alert)
-                continue
-
-            if pos.direction == "SHORT" and current_price >= pos.stop_loss:
-                alert = self._close_position(pos, ExitReason.STOP_LOSS, current_price, pnl)
-                alerts.append(alert)
-                continue
-
-            # ── Check Take Profit 1 (partial) ────────────
-            if pos.status == PositionStatus.OPEN:
-                if pos.direction == "LONG" and current_price >= pos.take_profit_1:
-                    alert = self._partial_tp(pos, current_price, pnl)
-                    alerts.append(alert)
-                    continue
-
-                if pos.direction == "SHORT" and current_price <= pos.take_profit_1:
-                    alert = self._partial_tp(pos, current_price, pnl)
-                    alerts.append(alert)
-                    continue
-
-            # ── Check Take Profit 2 (full) ───────────────
-            if pos.direction == "LONG" and current_price >= pos.take_profit_2:
-                alert = self._close_position(pos, ExitReason.TAKE_PROFIT_2, current_price, pnl)
-                alerts.append(alert)
-                continue
-
-            if pos.direction == "SHORT" and current_price <= pos.take_profit_2:
-                alert = self._close_position(pos, ExitReason.TAKE_PROFIT_2, current_price, pnl)
-                alerts.append(alert)
-                continue
-
-            # ── Check Time Exit ──────────────────────────
-            if pos.is_expired:
-                alert = self._close_position(pos, ExitReason.TIME_EXIT, current_price, pnl)
-                alerts.append(alert)
-                continue
+        now = datetime.now(timezone.utc)
 
+        # Missing prices become NaN — every comparison below is then False
+        last = np.array([prices.get(p.symbol) for p in rows], dtype=np.float64)
+        sign = self._dir_sign
+        px = sign * last
+
+        pnl = sign * (last - self._entry) / self._entry * 100
+        sl_hit = px <= self._sl_signed
+        tp1_hit = self._tp1_open & (px >= self._tp1_signed)
+        tp2_hit = px >= self._tp2_signed
+        expired = (_to_ms(now) - self._opened_ms) >= _EXIT_TIME_MS
+
+        alerts = []
+        for i in np.flatnonzero(~np.isnan(last)):
+            pos = rows[i]
+            current_price = float(last[i])
+            pos_pnl = float(pnl[i])
+
+            if sl_hit[i]:
+                alerts.append(self._close_position(pos, ExitReason.STOP_LOSS, current_price, pos_pnl, now))
+            elif tp1_hit[i]:
+                alerts.append(self._partial_tp(pos, current_price, pos_pnl, now))
+            elif tp2_hit[i]:
+                alerts.append(self._close_position(pos, ExitReason.TAKE_PROFIT_2, current_price, pos_pnl, now))
+            elif expired[i]:
+                alerts.append(self._close_position(pos, ExitReason.TIME_EXIT, current_price, pos_pnl, now))
+
+        if alerts:
+            self._rebuild_arrays()
         return alerts
 
     def _close_position(
         self, pos: TrackedPosition, reason: ExitReason,
-        current_price: float, pnl: float
+        current_price: float, pnl: float, now: datetime
     ) -> ExitAlert:
         """Close a position and create an alert."""
         pos.status = PositionStatus.CLOSED
         pos.exit_reason = reason
         pos.exit_price = current_price
-        pos.closed_at = datetime.now(timezone.utc)
+        pos.closed_at = now
         self._history.append(pos)
 
-        pnl_emoji = "✅" if pnl >= 0 else "❌"
-        msg = (
-            f"{'━' * 30}\n"
-            f"{reason.value}\n"
-            f"{'━' * 30}\n"
-            f"\n"
-            f"📊 *{pos.symbol}* — {pos.direction}\n"
-            f"📍 Entry: `{pos.entry_price:,.2f}`\n"
-            f"📍 Exit:  `{current_price:,.2f}`\n"
-            f"\n"
-            f"{pnl_emoji} *PnL:* `{pnl:+.2f}%`\n"
-            f"💰 Розмір: {pos.position_size_pct}% депозиту\n"
-            f"⏱ Тривалість: {pos.age_hours:.1f}h\n"
-            f"\n"
-            f"🕐 {pos.closed_at.strftime('%Y-%m-%d %H:%M UTC')}\n"
-            f"{'━' * 30}"
+        msg = _CLOSE_TMPL.format(
+            reason=reason.label,
+            symbol=pos.symbol,
+            direction=pos.direction,
+            entry=pos.entry_price,
+            exit=current_price,
+            pnl_emoji="✅" if pnl >= 0 else "❌",
+            pnl=pnl,
+            size=pos.position_size_pct,
+            age=_age_hours(pos, now),
+            closed_at=pos.closed_at,
         )
 
-        logger.info(f"{reason.value}: {pos.symbol} PnL={pnl:+.2f}%")
+        logger.info(f"{reason.label}: {pos.symbol} PnL={pnl:+.2f}%")
 
         return ExitAlert(
             position=pos,
@@ -219,7 +320,7 @@ class ExitTracker:
         )
 
     def _partial_tp(
-        self, pos: TrackedPosition, current_price: float, pnl: float
+        self, pos: TrackedPosition, current_price: float, pnl: float, now: datetime
     ) -> ExitAlert:
         """Partial take profit — move SL to breakeven and alert."""
         pos.status = PositionStatus.TP1_HIT
@@ -228,22 +329,14 @@ class ExitTracker:
         old_sl = pos.stop_loss
         pos.stop_loss = pos.entry_price
 
-        msg = (
-            f"{'━' * 30}\n"
-            f"{ExitReason.TAKE_PROFIT_1.value}\n"
-            f"{'━' * 30}\n"
-            f"\n"
-            f"📊 *{pos.symbol}* — {pos.direction}\n"
-            f"📍 Entry: `{pos.entry_price:,.2f}`\n"
-            f"📍 TP1:   `{current_price:,.2f}`\n"
-            f"\n"
-            f"✅ *PnL:* `{pnl:+.2f}%`\n"
-            f"💡 Закрийте {config.TP_PARTIAL_PCT}% позиції!\n"
-            f"🔒 SL переміщено → беззбитковість (`{pos.entry_price:,.2f}`)\n"
-            f"🎯 Чекаємо TP2: `{pos.take_profit_2:,.2f}`\n"
-            f"\n"
-            f"🕐 {datetime.now(timezone.utc).strftime('%H:%M UTC')}\n"
-            f"{'━' * 30}"
+        msg = _PARTIAL_TP_TMPL.format(
+            symbol=pos.symbol,
+            direction=pos.direction,
+            entry=pos.entry_price,
+            price=current_price,
+            pnl=pnl,
+            tp2=pos.take_profit_2,
+            now=now,
         )
 
         logger.info(
@@ -264,6 +357,7 @@ class ExitTracker:
         if not self.open_positions:
             return "📭 Немає відкритих позицій"
 
+        now = datetime.now(timezone.utc)
         lines = [f"📋 *Відкриті позиції ({self.position_count}):*\n"]
         for pos in self.open_positions:
             status = "🟡 TP1 hit" if pos.status == PositionStatus.TP1_HIT else "🟢 Open"
@@ -271,7 +365,7 @@ class ExitTracker:
                 f"  • *{pos.symbol}* {pos.direction} | {status}\n"
                 f"    Entry: `{pos.entry_price:,.2f}` | SL: `{pos.stop_loss:,.2f}`\n"
                 f"    TP1: `{pos.take_profit_1:,.2f}` | TP2: `{pos.take_profit_2:,.2f}`\n"
-                f"    Age: {pos.age_hours:.1f}h / {config.EXIT_TIME_HOURS}h | Size: {pos.position_size_pct}%"
+                f"    Age: {_age_hours(pos, now):.1f}h / {EXIT_TIME_HOURS}h | Size: {pos.position_size_pct}%"
             )
         return "\n".join(lines)
 
@@ -297,7 +391,7 @@ class ExitTracker:
             emoji = "✅" if pnl >= 0 else "❌"
             lines.append(
                 f"  {emoji} {p.symbol} {p.direction} | "
-                f"{pnl:+.2f}% | {p.exit_reason.value if p.exit_reason else '?'}"
+                f"{pnl:+.2f}% | {p.exit_reason.label if p.exit_reason is not None else '?'}"
             )
 
         return "\n".join(lines)
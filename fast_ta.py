@@ -0,0 +1,516 @@
+"""
+fast_ta — ndarray versions of the ta_compat indicators.
+Every indicator is a single forward pass compiled with Numba (plain
+Python if numba is missing); the *_last variants return only the bars the
+decisions read. Values match the
+ta_compat counterparts without building intermediate pandas frames.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from numba_compat import load_aot, njit
+
+
+@njit(cache=True, nogil=True, inline="always")
+def _ewm_step(weighted: float, old_wt: float, cur: float, alpha: float):
+    """One adjust=False EWM update (pandas' recurrence) → (weighted, old_wt)."""
+    if weighted == weighted:
+        old_wt *= 1.0 - alpha
+        if cur == cur:
+            if weighted != cur:
+                weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+            old_wt = 1.0
+    elif cur == cur:
+        weighted = cur
+    return weighted, old_wt
+
+
+@njit(cache=True, nogil=True)
+def _ewm_com(x: np.ndarray, com: float, min_periods: int) -> np.ndarray:
+    """
+    EWM mean with adjust=False — same recurrence as pandas'
+    Series.ewm(com=..., min_periods=..., adjust=False).mean(), including
+    leading NaNs (gaps inside the series are weighted as in pandas 2.x).
+    """
+    alpha = 1.0 / (1.0 + com)
+    n = x.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+    min_periods = max(min_periods, 1)
+    weighted = x[0]
+    nobs = 1 if weighted == weighted else 0
+    out[0] = weighted if nobs >= min_periods else np.nan
+    old_wt = 1.0
+
+    for i in range(1, n):
+        cur = x[i]
+        if cur == cur:
+            nobs += 1
+        weighted, old_wt = _ewm_step(weighted, old_wt, cur, alpha)
+        out[i] = weighted if nobs >= min_periods else np.nan
+    return out
+
+
+@njit(cache=True, nogil=True)
+def ewm(x: np.ndarray, alpha: float, min_periods: int) -> np.ndarray:
+    """Series.ewm(alpha=...) — pandas converts alpha to com first, so do the same."""
+    return _ewm_com(x, (1.0 - alpha) / alpha, min_periods)
+
+
+@njit(cache=True, nogil=True)
+def ema(x: np.ndarray, length: int) -> np.ndarray:
+    """Exponential Moving Average (ta_compat.ema)."""
+    return _ewm_com(x, (length - 1) / 2, 0)
+
+
+@lru_cache(maxsize=32)
+def _ema_weights(length: int, n: int) -> np.ndarray:
+    """Closed-form EMA weights: (1-a)^(n-1) for x[0], a(1-a)^(n-1-i) for x[i]."""
+    alpha = 2.0 / (length + 1)
+    w = (1.0 - alpha) ** np.arange(n - 1, -1, -1, dtype=np.float64)
+    w[1:] *= alpha
+    w.flags.writeable = False
+    return w
+
+
+def ema_last(x: np.ndarray, length: int) -> float:
+    """
+    Last EMA value only, as one dot product with cached geometric weights.
+    Falls back to the full recurrence when x has gaps (NaN).
+    """
+    value = float(np.dot(_ema_weights(length, len(x)), x))
+    if value != value:
+        return float(ema(x, length)[-1])
+    return value
+
+
+@njit(cache=True, nogil=True, inline="always")
+def _rsi_pass(close: np.ndarray, length: int, out: np.ndarray):
+    """
+    Price change, gain / loss split and their Wilder smoothing in one pass.
+    Writes RSI for every bar into `out` when it has one slot per bar (an
+    empty `out` skips the stores) and returns (avg_gain, avg_loss) at the
+    last bar, NaN until `length` changes have been seen.
+    """
+    n = close.shape[0]
+    store = out.shape[0] == n
+    # Same alpha as ewm(x, 1 / length, ...): alpha → com → alpha
+    a = 1.0 / length
+    alpha = 1.0 / (1.0 + (1.0 - a) / a)
+    min_periods = max(length, 1)
+
+    gain_w = loss_w = np.nan
+    gain_ow = loss_ow = 1.0
+    nobs = 0
+    avg_gain = avg_loss = np.nan
+    for i in range(n):
+        # First bar has no previous close: no change yet
+        delta = close[i] - close[i - 1] if i > 0 else np.nan
+        if delta == delta:
+            nobs += 1
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+        else:
+            gain = loss = np.nan
+        gain_w, gain_ow = _ewm_step(gain_w, gain_ow, gain, alpha)
+        loss_w, loss_ow = _ewm_step(loss_w, loss_ow, loss, alpha)
+
+        if nobs >= min_periods:
+            avg_gain, avg_loss = gain_w, loss_w
+        if store:
+            out[i] = 100 - 100 / (1 + avg_gain / avg_loss) if avg_loss != 0 else np.nan
+    return avg_gain, avg_loss
+
+
+@njit(cache=True, nogil=True)
+def rsi(close: np.ndarray, length: int) -> np.ndarray:
+    """Relative Strength Index with Wilder smoothing (ta_compat.rsi)."""
+    out = np.empty(close.shape[0], dtype=np.float64)
+    _rsi_pass(close, length, out)
+    return out
+
+
+@njit(cache=True, nogil=True)
+def rsi_averages(close: np.ndarray, length: int) -> tuple[float, float]:
+    """Wilder (avg_gain, avg_loss) at the last bar — the RSI recurrence state."""
+    return _rsi_pass(close, length, np.empty(0, dtype=np.float64))
+
+
+@njit(cache=True, nogil=True, inline="always")
+def _macd_pass(close: np.ndarray, fast: int, slow: int, signal: int,
+               macd_out: np.ndarray, signal_out: np.ndarray, hist_out: np.ndarray):
+    """
+    The fast, slow and signal EMAs advanced together in one pass over close.
+    Writes every bar into the outputs when they have one slot per bar (empty
+    outputs skip the stores) and returns (macd, signal, histogram) at the last bar.
+    """
+    n = close.shape[0]
+    if n == 0:
+        return np.nan, np.nan, np.nan
+    store = macd_out.shape[0] == n
+
+    # Same alphas as ema(): span → com → alpha
+    a_fast = 1.0 / (1.0 + (fast - 1) / 2)
+    a_slow = 1.0 / (1.0 + (slow - 1) / 2)
+    a_sig = 1.0 / (1.0 + (signal - 1) / 2)
+
+    e_fast = e_slow = close[0]
+    m = e_fast - e_slow
+    e_sig = m
+    w_fast = w_slow = w_sig = 1.0
+    if store:
+        macd_out[0], signal_out[0], hist_out[0] = m, e_sig, m - e_sig
+
+    for i in range(1, n):
+        e_fast, w_fast = _ewm_step(e_fast, w_fast, close[i], a_fast)
+        e_slow, w_slow = _ewm_step(e_slow, w_slow, close[i], a_slow)
+        m = e_fast - e_slow
+        e_sig, w_sig = _ewm_step(e_sig, w_sig, m, a_sig)
+        if store:
+            macd_out[i] = m
+            signal_out[i] = e_sig
+            hist_out[i] = m - e_sig
+    return m, e_sig, m - e_sig
+
+
+@njit(cache=True, nogil=True)
+def macd(close: np.ndarray, fast: int, slow: int, signal: int):
+    """
+    (macd, signal, histogram) lines (ta_compat.macd) — same values as three
+    separate ema() passes, without the intermediate arrays.
+    """
+    n = close.shape[0]
+    macd_line = np.empty(n, dtype=np.float64)
+    signal_line = np.empty(n, dtype=np.float64)
+    histogram = np.empty(n, dtype=np.float64)
+    _macd_pass(close, fast, slow, signal, macd_line, signal_line, histogram)
+    return macd_line, signal_line, histogram
+
+
+@njit(cache=True, nogil=True)
+def macd_last(close: np.ndarray, fast: int, slow: int, signal: int) -> tuple[float, float, float]:
+    """(macd, signal, histogram) at the last bar only — nothing per bar is stored."""
+    empty = np.empty(0, dtype=np.float64)
+    return _macd_pass(close, fast, slow, signal, empty, empty, empty)
+
+
+@njit(cache=True, nogil=True, inline="always")
+def _fmax(a: float, b: float) -> float:
+    """Scalar np.fmax: NaN only when both sides are NaN."""
+    if a != a:
+        return b
+    if b != b:
+        return a
+    return a if a >= b else b
+
+
+@njit(cache=True, nogil=True, inline="always")
+def _atr_pass(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+              length: int, out: np.ndarray) -> float:
+    """
+    True range and its Wilder smoothing in one pass. Writes every bar into
+    `out` when it has one slot per bar (an empty `out` skips the stores) and
+    returns the value at the last bar.
+    """
+    n = close.shape[0]
+    if n == 0:
+        return np.nan
+    store = out.shape[0] == n
+    # Same alpha as ewm(x, 1 / length, ...): alpha → com → alpha
+    a = 1.0 / length
+    alpha = 1.0 / (1.0 + (1.0 - a) / a)
+    min_periods = max(length, 1)
+
+    # First bar has no previous close: true range is just high - low
+    weighted = high[0] - low[0]
+    nobs = 1 if weighted == weighted else 0
+    if store:
+        out[0] = weighted if nobs >= min_periods else np.nan
+    old_wt = 1.0
+
+    for i in range(1, n):
+        prev_close = close[i - 1]
+        tr = _fmax(_fmax(high[i] - low[i], abs(high[i] - prev_close)), abs(low[i] - prev_close))
+        if tr == tr:
+            nobs += 1
+        weighted, old_wt = _ewm_step(weighted, old_wt, tr, alpha)
+        if store:
+            out[i] = weighted if nobs >= min_periods else np.nan
+    return weighted if nobs >= min_periods else np.nan
+
+
+@njit(cache=True, nogil=True)
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int) -> np.ndarray:
+    """
+    Average True Range (ta_compat.atr) — true range and its Wilder smoothing
+    in one pass, without a separate true-range array.
+    """
+    out = np.empty(close.shape[0], dtype=np.float64)
+    _atr_pass(high, low, close, length, out)
+    return out
+
+
+@njit(cache=True, nogil=True)
+def atr_last(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int) -> float:
+    """Last ATR value only (atr(...)[-1]) — nothing per bar is stored."""
+    return _atr_pass(high, low, close, length, np.empty(0, dtype=np.float64))
+
+
+@njit(cache=True, nogil=True)
+def bbands(close: np.ndarray, length: int, std: float):
+    """
+    (lower, mid, upper) Bollinger Bands (ta_compat.bbands) in one pass: a
+    Welford running mean / sum of squared deviations is updated as each bar
+    enters and leaves the window, instead of separate rolling mean and std
+    passes. Sample std (ddof=1); a window holding a NaN gives NaN.
+    """
+    n = close.shape[0]
+    lower = np.full(n, np.nan)
+    mid = np.full(n, np.nan)
+    upper = np.full(n, np.nan)
+
+    mean = 0.0
+    m2 = 0.0
+    nobs = 0
+    nans = 0
+    same_run = 0        # bars in a row equal to the current one
+    for i in range(n):
+        x = close[i]
+        if x == x:
+            nobs += 1
+            delta = x - mean
+            mean += delta / nobs
+            m2 += delta * (x - mean)
+        else:
+            nans += 1
+        same_run = same_run + 1 if i > 0 and x == close[i - 1] else 1
+
+        if i >= length:
+            y = close[i - length]
+            if y == y:
+                nobs -= 1
+                if nobs > 0:
+                    delta = y - mean
+                    mean -= delta / nobs
+                    m2 -= delta * (y - mean)
+                else:
+                    mean = 0.0
+                    m2 = 0.0
+            else:
+                nans -= 1
+
+        if i < length - 1 or nans > 0:
+            continue
+        if length < 2:
+            sd = np.nan
+        elif same_run >= length:
+            sd = 0.0    # flat window: exactly zero, not rounding residue
+        else:
+            sd = np.sqrt(max(m2 / (length - 1), 0.0))
+        mid[i] = mean
+        lower[i] = mean - std * sd
+        upper[i] = mean + std * sd
+    return lower, mid, upper
+
+
+@njit(cache=True, nogil=True)
+def stoch(x: np.ndarray, length: int, k: int, d: int):
+    """
+    (%K, %D) stochastic of x (ta_compat.stochrsi on RSI values) in one pass.
+    Rolling min / max come from two monotonic index deques kept in ring
+    buffers, and the %K / %D means from two small rings of the last k and d
+    values. A window holding a NaN, or a flat window, gives NaN.
+    """
+    n = x.shape[0]
+    k_line = np.full(n, np.nan)
+    d_line = np.full(n, np.nan)
+
+    lo_q = np.empty(length, dtype=np.int64)
+    hi_q = np.empty(length, dtype=np.int64)
+    lo_head = lo_len = hi_head = hi_len = 0
+    k_ring = np.full(k, np.nan)
+    d_ring = np.full(d, np.nan)
+    nans = 0
+    for i in range(n):
+        # Drop indices that slid out of the window
+        if lo_len and lo_q[lo_head] <= i - length:
+            lo_head = (lo_head + 1) % length
+            lo_len -= 1
+        if hi_len and hi_q[hi_head] <= i - length:
+            hi_head = (hi_head + 1) % length
+            hi_len -= 1
+        if i >= length and x[i - length] != x[i - length]:
+            nans -= 1
+
+        v = x[i]
+        if v == v:
+            while lo_len and x[lo_q[(lo_head + lo_len - 1) % length]] >= v:
+                lo_len -= 1
+            lo_q[(lo_head + lo_len) % length] = i
+            lo_len += 1
+            while hi_len and x[hi_q[(hi_head + hi_len - 1) % length]] <= v:
+                hi_len -= 1
+            hi_q[(hi_head + hi_len) % length] = i
+            hi_len += 1
+        else:
+            nans += 1
+
+        st = np.nan
+        if i >= length - 1 and nans == 0:
+            lowest = x[lo_q[lo_head]]
+            span = x[hi_q[hi_head]] - lowest
+            if span != 0:
+                st = (v - lowest) / span * 100
+
+        k_ring[i % k] = st
+        if i >= k - 1:
+            k_line[i] = k_ring.sum() / k
+        d_ring[i % d] = k_line[i]
+        if i >= d - 1:
+            d_line[i] = d_ring.sum() / d
+    return k_line, d_line
+
+
+# ── Tail-only variants: just the bars the decisions read ──
+
+def _tail(x: np.ndarray, n: int) -> np.ndarray:
+    """Last n values, NaN-padded at the front when x is shorter (like a rolling window)."""
+    if len(x) >= n:
+        return x[-n:]
+    return np.concatenate((np.full(n - len(x), np.nan), x))
+
+
+def bbands_last2(close: np.ndarray, length: int, std: float) -> tuple[tuple, tuple]:
+    """(lower, upper) Bollinger Bands for the last two bars (ta_compat.bbands)."""
+    windows = sliding_window_view(_tail(close, length + 1), length)
+    mid = windows.mean(axis=1)
+    dev = std * windows.std(axis=1, ddof=1)
+    lower, upper = mid - dev, mid + dev
+    return (lower[0], upper[0]), (lower[1], upper[1])
+
+
+def stochrsi_last2(close: np.ndarray, length: int, rsi_length: int,
+                   k: int, d: int) -> tuple[tuple, tuple]:
+    """(%K, %D) for the last two bars (ta_compat.stochrsi)."""
+    rsi_vals = _tail(rsi(close, rsi_length), length + k + d - 1)
+    k_line, d_line = stoch(rsi_vals, length, k, d)
+    return (k_line[-2], d_line[-2]), (k_line[-1], d_line[-1])
+
+
+@njit(cache=True, nogil=True, inline="always")
+def _div(num: float, den: float) -> float:
+    """num / den with numpy's x/0 → ±inf / NaN instead of ZeroDivisionError."""
+    if den == 0:
+        if num != num or num == 0:
+            return np.nan
+        return np.inf if num > 0 else -np.inf
+    return num / den
+
+
+@njit(cache=True, nogil=True, inline="always")
+def _adx_pass(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int,
+              adx_out: np.ndarray, dmp_out: np.ndarray, dmn_out: np.ndarray):
+    """
+    Directional movement, true range, their Wilder smoothing, DI, DX and ADX
+    in one pass over the bars. Writes every bar into the outputs when they
+    have one slot per bar (empty outputs skip the stores) and returns
+    (ADX, +DI, -DI) at the last bar.
+    """
+    n = close.shape[0]
+    store = adx_out.shape[0] == n
+    # Same alpha as ewm(x, 1 / length, ...): alpha → com → alpha
+    a = 1.0 / length
+    alpha = 1.0 / (1.0 + (1.0 - a) / a)
+    min_periods = max(length, 1)
+
+    tr_w = pdm_w = ndm_w = adx_w = np.nan
+    tr_ow = pdm_ow = ndm_ow = adx_ow = 1.0
+    tr_n = pdm_n = ndm_n = adx_n = 0
+    adx_val = plus_di = minus_di = np.nan
+    for i in range(n):
+        if i == 0:
+            # No previous bar: true range is just high - low, no movement yet
+            tr = high[0] - low[0]
+            pdm = ndm = np.nan
+        else:
+            prev_close = close[i - 1]
+            tr = _fmax(_fmax(high[i] - low[i], abs(high[i] - prev_close)), abs(low[i] - prev_close))
+            up = high[i] - high[i - 1]
+            dn = low[i - 1] - low[i]
+            # Wilder: only the larger positive move counts, ties count for neither
+            pdm = up if up != up or (up > 0 and not dn >= up) else 0.0
+            ndm = dn if dn != dn or (dn > 0 and not up >= dn) else 0.0
+
+        if tr == tr:
+            tr_n += 1
+        if pdm == pdm:
+            pdm_n += 1
+        if ndm == ndm:
+            ndm_n += 1
+        tr_w, tr_ow = _ewm_step(tr_w, tr_ow, tr, alpha)
+        pdm_w, pdm_ow = _ewm_step(pdm_w, pdm_ow, pdm, alpha)
+        ndm_w, ndm_ow = _ewm_step(ndm_w, ndm_ow, ndm, alpha)
+
+        atr_val = tr_w if tr_n >= min_periods else np.nan
+        plus_di = 100 * _div(pdm_w if pdm_n >= min_periods else np.nan, atr_val)
+        minus_di = 100 * _div(ndm_w if ndm_n >= min_periods else np.nan, atr_val)
+        di_sum = plus_di + minus_di
+        dx = 100 * abs(plus_di - minus_di) / di_sum if di_sum != 0 else np.nan
+
+        if dx == dx:
+            adx_n += 1
+        adx_w, adx_ow = _ewm_step(adx_w, adx_ow, dx, alpha)
+        adx_val = adx_w if adx_n >= min_periods else np.nan
+        if store:
+            adx_out[i] = adx_val
+            dmp_out[i] = plus_di
+            dmn_out[i] = minus_di
+    return adx_val, plus_di, minus_di
+
+
+@njit(cache=True, nogil=True)
+def adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int):
+    """(ADX, +DI, -DI) arrays (ta_compat.adx) from one fused pass."""
+    n = close.shape[0]
+    adx_out = np.empty(n, dtype=np.float64)
+    dmp_out = np.empty(n, dtype=np.float64)
+    dmn_out = np.empty(n, dtype=np.float64)
+    _adx_pass(high, low, close, length, adx_out, dmp_out, dmn_out)
+    return adx_out, dmp_out, dmn_out
+
+
+@njit(cache=True, nogil=True)
+def adx_last(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+             length: int) -> tuple[float, float, float]:
+    """(ADX, +DI, -DI) for the last bar only — nothing per bar is stored."""
+    empty = np.empty(0, dtype=np.float64)
+    return _adx_pass(high, low, close, length, empty, empty, empty)
+
+
+_aot = load_aot("ewm", "ema", "rsi", "rsi_averages", "macd", "macd_last",
+                "atr", "atr_last", "bbands", "stoch", "adx", "adx_last")
+if _aot is not None:
+    # Prebuilt by build_kernels.py — no JIT compile at startup
+    ewm, ema, rsi, macd = _aot.ewm, _aot.ema, _aot.rsi, _aot.macd
+    rsi_averages, macd_last = _aot.rsi_averages, _aot.macd_last
+    atr, atr_last, bbands = _aot.atr, _aot.atr_last, _aot.bbands
+    stoch, adx, adx_last = _aot.stoch, _aot.adx, _aot.adx_last
+else:
+    # Compile at import so the first scan doesn't pay for it
+    _warm = np.linspace(1.0, 2.0, 40)
+    ema(_warm, 5)
+    rsi(_warm, 5)
+    rsi_averages(_warm, 5)
+    macd(_warm, 3, 6, 2)
+    macd_last(_warm, 3, 6, 2)
+    atr(_warm + 0.1, _warm - 0.1, _warm, 5)
+    atr_last(_warm + 0.1, _warm - 0.1, _warm, 5)
+    bbands(_warm, 5, 2.0)
+    stoch(_warm, 5, 3, 3)
+    adx(_warm + 0.1, _warm - 0.1, _warm, 5)
+    adx_last(_warm + 0.1, _warm - 0.1, _warm, 5)
+    del _warm
@@ -3,12 +3,21 @@ Technical indicator calculations.
 Each indicator returns an IndicatorResult with direction, confidence, and description.
 """
 
-import pandas as pd
-import ta_compat as ta  # pure-pandas reimplementation (Python 3.9 compat)
+import bisect
+import functools
+import math
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import config
-from dataclasses import dataclass
+import _kernels as _k
+import fast_ta
+from data_fetcher import OHLCV
 from enum import Enum
-from typing import Optional
+from typing import NamedTuple, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,16 +29,282 @@ class Direction(Enum):
     NEUTRAL = "NEUTRAL"
 
 
-@dataclass
-class IndicatorResult:
-    """Result of a single indicator analysis."""
+class IndicatorResult(NamedTuple):
+    """
+    Result of a single indicator analysis (immutable, tuple-backed).
+    The description is kept as a template plus its values and only
+    formatted when it is read — most results never reach a message.
+    """
     name: str
     direction: Direction
     confidence: float        # 0.0 – 1.0
-    description: str
+    template: str            # description; {fields} are filled from `values`
+    values: Optional[dict] = None
+
+    @property
+    def description(self) -> str:
+        return self.template.format(**self.values) if self.values else self.template
+
+
+_DIRECTIONS = {
+    _k.DIR_LONG: Direction.LONG,
+    _k.DIR_SHORT: Direction.SHORT,
+    _k.DIR_NEUTRAL: Direction.NEUTRAL,
+}
+
+# Description templates per (indicator, branch id returned by its _kernels decision)
+DESC: dict[tuple[str, int], str] = {
+    ("EMA Cross", 0): "EMAs intertwined — no clear signal",
+    ("EMA Cross", 1): f"EMA{config.EMA_FAST} crossed above EMA{config.EMA_SLOW}",
+    ("EMA Cross", 2): f"EMA{config.EMA_FAST} crossed below EMA{config.EMA_SLOW}",
+    ("EMA Cross", 3): f"EMA{config.EMA_FAST} above EMA{config.EMA_SLOW} (trending)",
+    ("EMA Cross", 4): f"EMA{config.EMA_FAST} below EMA{config.EMA_SLOW} (trending)",
+    ("RSI", 0): "RSI neutral ({curr:.1f})",
+    ("RSI", 1): "RSI recovering from oversold ({curr:.1f})",
+    ("RSI", 2): "RSI rejected from overbought ({curr:.1f})",
+    ("RSI", 3): "RSI in oversold zone ({curr:.1f})",
+    ("RSI", 4): "RSI in overbought zone ({curr:.1f})",
+    ("MACD", 0): "MACD no clear signal",
+    ("MACD", 1): "MACD bullish crossover",
+    ("MACD", 2): "MACD bearish crossover",
+    ("MACD", 3): "MACD histogram growing (bullish momentum)",
+    ("MACD", 4): "MACD histogram falling (bearish momentum)",
+    ("Bollinger Bands", 0): "Price within Bollinger Bands",
+    ("Bollinger Bands", 1): "Price bouncing off lower BB",
+    ("Bollinger Bands", 2): "Price rejected from upper BB",
+    ("Bollinger Bands", 3): "Price below lower BB (oversold)",
+    ("Bollinger Bands", 4): "Price above upper BB (overbought)",
+    ("Bollinger Bands", 5): "Zero bandwidth",
+    ("Stoch RSI", 0): "StochRSI neutral ({k:.0f})",
+    ("Stoch RSI", 1): "StochRSI bullish crossover in oversold ({k:.0f})",
+    ("Stoch RSI", 2): "StochRSI bearish crossover in overbought ({k:.0f})",
+    ("Stoch RSI", 3): "StochRSI oversold ({k:.0f})",
+    ("Stoch RSI", 4): "StochRSI overbought ({k:.0f})",
+    ("ADX", 0): f"ADX weak trend ({{adx:.1f}} < {config.ADX_THRESHOLD})",
+    ("ADX", 1): "ADX {adx:.0f} bullish (+DI {plus:.0f} > -DI {minus:.0f})",
+    ("ADX", 2): "ADX {adx:.0f} bearish (-DI {minus:.0f} > +DI {plus:.0f})",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _neutral(name: str, text: str) -> IndicatorResult:
+    """
+    Zero-confidence NEUTRAL result with a static description. Results are
+    immutable, so each (indicator, text) pair is built once and shared.
+    """
+    return IndicatorResult(name, Direction.NEUTRAL, 0.0, text)
+
+
+def _result(name: str, direction: int, conf: float, branch: int, **values) -> IndicatorResult:
+    """Build an IndicatorResult from a decision kernel's output."""
+    if direction == _k.DIR_NEUTRAL and conf == 0.0 and not values:
+        return _neutral(name, DESC[(name, branch)])
+    return IndicatorResult(name, _DIRECTIONS[direction], conf, DESC[(name, branch)], values)
+
+
+# ── Streaming recurrence state ─────────────────────────
+# EMA / Wilder recurrences (EMA, RSI, MACD, ATR, ADX) only need their previous
+# value, so per-series state is kept at the last *closed* bar and advanced over
+# the bars added since the previous call. The newest bar is still forming and is re-applied every call.
+# A series is identified by OHLCV.key (e.g. "BTC/USDT:USDT_1h").
+_stream_state: dict[tuple[str, str], tuple[int, tuple]] = {}
+
+
+def _stream_last2(data: OHLCV, name: str, seed, step) -> tuple[tuple, tuple]:
+    """
+    Return the recurrence state after the last two bars of data.
+    seed(end)      → state after bar `end`, computed over data[:end + 1]
+    step(state, i) → state after bar i, given the state after bar i - 1
+    """
+    closed = len(data) - 2
+    key = data.key
+    state = None
+
+    if key is not None and (key, name) in _stream_state:
+        last_ts, cached = _stream_state[(key, name)]
+        start = int(np.searchsorted(data.ts, last_ts))
+        # Otherwise the history no longer overlaps — reseed
+        if start <= closed and data.ts[start] == last_ts:
+            state = cached
+            for i in range(start + 1, closed + 1):
+                state = step(state, i)
+
+    if state is None:
+        state = seed(closed)
+    if key is not None and not any(math.isnan(v) for v in state):
+        _stream_state[(key, name)] = (int(data.ts[closed]), state)
+
+    return state, step(state, closed + 1)
+
+
+def _ema_last2(data: OHLCV, length: int) -> tuple[float, float]:
+    """(previous, current) EMA of close."""
+    x = data.close
+    alpha = 2 / (length + 1)
+
+    def seed(end):
+        return (fast_ta.ema_last(x[:end + 1], length),)
+
+    def step(state, i):
+        return ((1 - alpha) * state[0] + alpha * x[i],)
+
+    prev, curr = _stream_last2(data, f"ema_{length}", seed, step)
+    return prev[0], curr[0]
+
+
+def _rsi_value(avg_gain: float, avg_loss: float) -> float:
+    if avg_loss == 0:
+        return float("nan")
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def _rsi_last2(data: OHLCV, length: int) -> tuple[float, float]:
+    """(previous, current) RSI of close with Wilder smoothing."""
+    x = data.close
+    alpha = 1 / length
+
+    def seed(end):
+        avg_gain, avg_loss = fast_ta.rsi_averages(x[:end + 1], length)
+        return float(avg_gain), float(avg_loss)
+
+    def step(state, i):
+        delta = x[i] - x[i - 1]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        return ((1 - alpha) * state[0] + alpha * gain,
+                (1 - alpha) * state[1] + alpha * loss)
+
+    prev, curr = _stream_last2(data, f"rsi_{length}", seed, step)
+    return _rsi_value(*prev), _rsi_value(*curr)
 
 
-def calculate_ema_cross(df: pd.DataFrame) -> IndicatorResult:
+def _macd_last2(data: OHLCV, fast: int, slow: int, signal: int) -> tuple[tuple, tuple]:
+    """(previous, current) (macd, signal, histogram) of close."""
+    x = data.close
+    a_fast, a_slow, a_sig = 2 / (fast + 1), 2 / (slow + 1), 2 / (signal + 1)
+
+    def seed(end):
+        fast_ema = fast_ta.ema(x[:end + 1], fast)
+        slow_ema = fast_ta.ema(x[:end + 1], slow)
+        signal_ema = fast_ta.ema(fast_ema - slow_ema, signal)
+        return float(fast_ema[-1]), float(slow_ema[-1]), float(signal_ema[-1])
+
+    def step(state, i):
+        e_fast = (1 - a_fast) * state[0] + a_fast * x[i]
+        e_slow = (1 - a_slow) * state[1] + a_slow * x[i]
+        e_sig = (1 - a_sig) * state[2] + a_sig * (e_fast - e_slow)
+        return e_fast, e_slow, e_sig
+
+    def lines(state):
+        macd_line = state[0] - state[1]
+        return macd_line, state[2], macd_line - state[2]
+
+    prev, curr = _stream_last2(data, f"macd_{fast}_{slow}_{signal}", seed, step)
+    return lines(prev), lines(curr)
+
+
+def _atr_last(data: OHLCV, length: int) -> float:
+    """Current ATR (Wilder smoothing of true range)."""
+    h, l, c = data.high, data.low, data.close
+    alpha = 1 / length
+
+    def seed(end):
+        return (float(fast_ta.atr_last(h[:end + 1], l[:end + 1], c[:end + 1], length)),)
+
+    def step(state, i):
+        tr = max(h[i] - l[i], abs(h[i] - c[i - 1]), abs(l[i] - c[i - 1]))
+        return ((1 - alpha) * state[0] + alpha * tr,)
+
+    _, curr = _stream_last2(data, f"atr_{length}", seed, step)
+    return curr[0]
+
+
+def _adx_last(data: OHLCV, length: int) -> tuple[float, float, float]:
+    """Current (ADX, +DI, -DI) — Wilder smoothing of true range, ±DM and DX."""
+    h, l, c = data.high, data.low, data.close
+    if len(data) < 2:
+        return fast_ta.adx_last(h, l, c, length)
+    alpha = 1 / length
+
+    def seed(end):
+        adx, plus_di, minus_di = fast_ta.adx_last(h[:end + 1], l[:end + 1], c[:end + 1], length)
+        atr = float(fast_ta.atr_last(h[:end + 1], l[:end + 1], c[:end + 1], length))
+        return atr, plus_di * atr / 100, minus_di * atr / 100, float(adx)
+
+    def step(state, i):
+        atr, plus_dm, minus_dm, adx = state
+        up, dn = h[i] - h[i - 1], l[i - 1] - l[i]
+        tr = max(h[i] - l[i], abs(h[i] - c[i - 1]), abs(l[i] - c[i - 1]))
+        atr = (1 - alpha) * atr + alpha * tr
+        plus_dm = (1 - alpha) * plus_dm + alpha * (up if up > dn and up > 0 else 0.0)
+        minus_dm = (1 - alpha) * minus_dm + alpha * (dn if dn > up and dn > 0 else 0.0)
+        # DX from the smoothed DMs directly — ATR cancels out of the DI ratio
+        dm_sum = plus_dm + minus_dm
+        if dm_sum != 0:
+            adx = (1 - alpha) * adx + alpha * 100 * abs(plus_dm - minus_dm) / dm_sum
+        return atr, plus_dm, minus_dm, adx
+
+    _, (atr, plus_dm, minus_dm, adx) = _stream_last2(data, f"adx_{length}", seed, step)
+    if atr == 0:
+        return adx, float("nan"), float("nan")
+    return adx, 100 * plus_dm / atr, 100 * minus_dm / atr
+
+
+def _volume_avg(data: OHLCV, length: int = 20) -> float:
+    """Mean volume of the last `length` bars via a running window sum."""
+    v = data.volume
+    if len(v) <= length:
+        return float(v[-length:].mean())
+
+    def seed(end):
+        return (float(v[end - length + 1:end + 1].sum()),)
+
+    def step(state, i):
+        return (state[0] + v[i] - v[i - length],)
+
+    _, curr = _stream_last2(data, f"vol_sum_{length}", seed, step)
+    return curr[0] / length
+
+
+# ── Per-bar result cache ───────────────────────────────
+# Closed bars never change, so (series, length, newest bar) identifies the
+# input completely. Repeat calls on the same bar — the same symbol analysed
+# twice in a cycle, or the REST and streamed views of it — reuse the result.
+_BAR_CACHE: OrderedDict[tuple, object] = OrderedDict()
+_BAR_CACHE_SIZE = 256
+_bar_cache_lock = threading.Lock()
+
+
+def bar_cache(fn):
+    """Memoise an indicator on the series key and its newest (possibly forming) bar."""
+    @functools.wraps(fn)
+    def wrapper(data: OHLCV):
+        if data.key is None or len(data) == 0:
+            return fn(data)
+        key = (fn.__name__, data.key, len(data), int(data.ts[-1]),
+               float(data.close[-1]), float(data.high[-1]),
+               float(data.low[-1]), float(data.volume[-1]))
+        with _bar_cache_lock:
+            if key in _BAR_CACHE:
+                _BAR_CACHE.move_to_end(key)
+                return _BAR_CACHE[key]
+        result = fn(data)
+        with _bar_cache_lock:
+            _BAR_CACHE[key] = result
+            if len(_BAR_CACHE) > _BAR_CACHE_SIZE:
+                _BAR_CACHE.popitem(last=False)
+        return result
+    return wrapper
+
+
+def _decide_ema_cross(prev_fast: float, curr_fast: float,
+                      prev_slow: float, curr_slow: float) -> IndicatorResult:
+    direction, conf, branch = _k.ema_cross_decide(prev_fast, curr_fast, prev_slow, curr_slow)
+    return _result("EMA Cross", direction, conf, branch)
+
+
+@bar_cache
+def calculate_ema_cross(data: OHLCV) -> IndicatorResult:
     """
     EMA Crossover (fast/slow).
     LONG  — fast EMA crosses above slow EMA
@@ -37,49 +312,27 @@ def calculate_ema_cross(df: pd.DataFrame) -> IndicatorResult:
     """
     name = "EMA Cross"
     try:
-        fast = ta.ema(df["close"], length=config.EMA_FAST)
-        slow = ta.ema(df["close"], length=config.EMA_SLOW)
+        if len(data) < 2:
+            return _neutral(name, "Insufficient data")
 
-        if fast is None or slow is None or len(fast) < 2:
-            return IndicatorResult(name, Direction.NEUTRAL, 0.0, "Insufficient data")
-
-        curr_fast, prev_fast = fast.iloc[-1], fast.iloc[-2]
-        curr_slow, prev_slow = slow.iloc[-1], slow.iloc[-2]
-
-        # Bullish crossover
-        if prev_fast <= prev_slow and curr_fast > curr_slow:
-            gap_pct = abs(curr_fast - curr_slow) / curr_slow * 100
-            conf = min(gap_pct / 0.5, 1.0)
-            return IndicatorResult(name, Direction.LONG, conf,
-                                   f"EMA{config.EMA_FAST} crossed above EMA{config.EMA_SLOW}")
-
-        # Bearish crossover
-        if prev_fast >= prev_slow and curr_fast < curr_slow:
-            gap_pct = abs(curr_fast - curr_slow) / curr_slow * 100
-            conf = min(gap_pct / 0.5, 1.0)
-            return IndicatorResult(name, Direction.SHORT, conf,
-                                   f"EMA{config.EMA_FAST} crossed below EMA{config.EMA_SLOW}")
-
-        # Trend continuation (no crossover but clear separation)
-        if curr_fast > curr_slow:
-            gap_pct = (curr_fast - curr_slow) / curr_slow * 100
-            if gap_pct > 0.3:
-                return IndicatorResult(name, Direction.LONG, min(gap_pct / 1.0, 0.6),
-                                       f"EMA{config.EMA_FAST} above EMA{config.EMA_SLOW} (trending)")
-        elif curr_fast < curr_slow:
-            gap_pct = (curr_slow - curr_fast) / curr_slow * 100
-            if gap_pct > 0.3:
-                return IndicatorResult(name, Direction.SHORT, min(gap_pct / 1.0, 0.6),
-                                       f"EMA{config.EMA_FAST} below EMA{config.EMA_SLOW} (trending)")
-
-        return IndicatorResult(name, Direction.NEUTRAL, 0.0, "EMAs intertwined — no clear signal")
+        prev_fast, curr_fast = _ema_last2(data, config.EMA_FAST)
+        prev_slow, curr_slow = _ema_last2(data, config.EMA_SLOW)
+        return _decide_ema_cross(prev_fast, curr_fast, prev_slow, curr_slow)
 
     except Exception as e:
-        logger.error(f"EMA Cross error: {e}")
+        logger.exception("EMA Cross error: %s", e)
         return IndicatorResult(name, Direction.NEUTRAL, 0.0, f"Error: {e}")
 
 
-def calculate_rsi(df: pd.DataFrame) -> IndicatorResult:
+def _decide_rsi(prev: float, curr: float) -> IndicatorResult:
+    direction, conf, branch = _k.rsi_decide(
+        prev, curr, float(config.RSI_OVERSOLD), float(config.RSI_OVERBOUGHT)
+    )
+    return _result("RSI", direction, conf, branch, curr=curr)
+
+
+@bar_cache
+def calculate_rsi(data: OHLCV) -> IndicatorResult:
     """
     RSI — Relative Strength Index.
     LONG  — RSI crosses above oversold level (recovery from oversold)
@@ -87,45 +340,28 @@ def calculate_rsi(df: pd.DataFrame) -> IndicatorResult:
     """
     name = "RSI"
     try:
-        rsi = ta.rsi(df["close"], length=config.RSI_PERIOD)
-        if rsi is None or len(rsi) < 2:
-            return IndicatorResult(name, Direction.NEUTRAL, 0.0, "Insufficient data")
-
-        curr, prev = rsi.iloc[-1], rsi.iloc[-2]
-
-        # Bullish: crossing above oversold
-        if prev <= config.RSI_OVERSOLD and curr > config.RSI_OVERSOLD:
-            conf = min((config.RSI_OVERSOLD - (prev + curr) / 2 + 10) / 20, 1.0)
-            return IndicatorResult(name, Direction.LONG, max(conf, 0.5),
-                                   f"RSI recovering from oversold ({curr:.1f})")
-
-        # Bearish: crossing below overbought
-        if prev >= config.RSI_OVERBOUGHT and curr < config.RSI_OVERBOUGHT:
-            conf = min(((prev + curr) / 2 - config.RSI_OVERBOUGHT + 10) / 20, 1.0)
-            return IndicatorResult(name, Direction.SHORT, max(conf, 0.5),
-                                   f"RSI rejected from overbought ({curr:.1f})")
-
-        # Deep oversold zone
-        if curr < config.RSI_OVERSOLD:
-            conf = min((config.RSI_OVERSOLD - curr) / 15, 0.7)
-            return IndicatorResult(name, Direction.LONG, conf,
-                                   f"RSI in oversold zone ({curr:.1f})")
+        if len(data) < 2:
+            return _neutral(name, "Insufficient data")
 
-        # Deep overbought zone
-        if curr > config.RSI_OVERBOUGHT:
-            conf = min((curr - config.RSI_OVERBOUGHT) / 15, 0.7)
-            return IndicatorResult(name, Direction.SHORT, conf,
-                                   f"RSI in overbought zone ({curr:.1f})")
-
-        return IndicatorResult(name, Direction.NEUTRAL, 0.0,
-                               f"RSI neutral ({curr:.1f})")
+        prev, curr = _rsi_last2(data, config.RSI_PERIOD)
+        return _decide_rsi(prev, curr)
 
     except Exception as e:
-        logger.error(f"RSI error: {e}")
+        logger.exception("RSI error: %s", e)
         return IndicatorResult(name, Direction.NEUTRAL, 0.0, f"Error: {e}")
 
 
-def calculate_macd(df: pd.DataFrame) -> IndicatorResult:
+def _decide_macd(prev_macd: float, curr_macd: float,
+                 prev_signal: float, curr_signal: float,
+                 prev_hist: float, curr_hist: float) -> IndicatorResult:
+    direction, conf, branch = _k.macd_decide(
+        prev_macd, curr_macd, prev_signal, curr_signal, prev_hist, curr_hist
+    )
+    return _result("MACD", direction, conf, branch)
+
+
+@bar_cache
+def calculate_macd(data: OHLCV) -> IndicatorResult:
     """
     MACD — Moving Average Convergence Divergence.
     LONG  — MACD line crosses above signal line
@@ -133,53 +369,30 @@ def calculate_macd(df: pd.DataFrame) -> IndicatorResult:
     """
     name = "MACD"
     try:
-        macd_df = ta.macd(df["close"],
-                          fast=config.MACD_FAST,
-                          slow=config.MACD_SLOW,
-                          signal=config.MACD_SIGNAL)
-        if macd_df is None or len(macd_df) < 2:
-            return IndicatorResult(name, Direction.NEUTRAL, 0.0, "Insufficient data")
-
-        macd_col = f"MACD_{config.MACD_FAST}_{config.MACD_SLOW}_{config.MACD_SIGNAL}"
-        signal_col = f"MACDs_{config.MACD_FAST}_{config.MACD_SLOW}_{config.MACD_SIGNAL}"
-        hist_col = f"MACDh_{config.MACD_FAST}_{config.MACD_SLOW}_{config.MACD_SIGNAL}"
-
-        curr_macd = macd_df[macd_col].iloc[-1]
-        prev_macd = macd_df[macd_col].iloc[-2]
-        curr_signal = macd_df[signal_col].iloc[-1]
-        prev_signal = macd_df[signal_col].iloc[-2]
-        curr_hist = macd_df[hist_col].iloc[-1]
-        prev_hist = macd_df[hist_col].iloc[-2]
-
-        # Bullish crossover
-        if prev_macd <= prev_signal and curr_macd > curr_signal:
-            conf = min(abs(curr_hist) / (abs(curr_macd) + 1e-10) * 2, 1.0)
-            return IndicatorResult(name, Direction.LONG, max(conf, 0.6),
-                                   "MACD bullish crossover")
-
-        # Bearish crossover
-        if prev_macd >= prev_signal and curr_macd < curr_signal:
-            conf = min(abs(curr_hist) / (abs(curr_macd) + 1e-10) * 2, 1.0)
-            return IndicatorResult(name, Direction.SHORT, max(conf, 0.6),
-                                   "MACD bearish crossover")
-
-        # Histogram growing (momentum increasing)
-        if curr_hist > 0 and curr_hist > prev_hist:
-            return IndicatorResult(name, Direction.LONG, 0.4,
-                                   "MACD histogram growing (bullish momentum)")
-        if curr_hist < 0 and curr_hist < prev_hist:
-            return IndicatorResult(name, Direction.SHORT, 0.4,
-                                   "MACD histogram falling (bearish momentum)")
+        if len(data) < 2:
+            return _neutral(name, "Insufficient data")
 
-        return IndicatorResult(name, Direction.NEUTRAL, 0.0,
-                               "MACD no clear signal")
+        (prev_macd, prev_signal, prev_hist), (curr_macd, curr_signal, curr_hist) = _macd_last2(
+            data, config.MACD_FAST, config.MACD_SLOW, config.MACD_SIGNAL
+        )
+        return _decide_macd(prev_macd, curr_macd, prev_signal, curr_signal, prev_hist, curr_hist)
 
     except Exception as e:
-        logger.error(f"MACD error: {e}")
+        logger.exception("MACD error: %s", e)
         return IndicatorResult(name, Direction.NEUTRAL, 0.0, f"Error: {e}")
 
 
-def calculate_bollinger_bands(df: pd.DataFrame) -> IndicatorResult:
+def _decide_bollinger(prev_close: float, close: float,
+                      prev_lower: float, lower: float,
+                      prev_upper: float, upper: float) -> IndicatorResult:
+    direction, conf, branch = _k.bollinger_decide(
+        prev_close, close, prev_lower, lower, prev_upper, upper
+    )
+    return _result("Bollinger Bands", direction, conf, branch)
+
+
+@bar_cache
+def calculate_bollinger_bands(data: OHLCV) -> IndicatorResult:
     """
     Bollinger Bands.
     LONG  — price bounces off lower band
@@ -187,62 +400,31 @@ def calculate_bollinger_bands(df: pd.DataFrame) -> IndicatorResult:
     """
     name = "Bollinger Bands"
     try:
-        bb = ta.bbands(df["close"], length=config.BB_PERIOD, std=config.BB_STD)
-        if bb is None or len(bb) < 2:
-            return IndicatorResult(name, Direction.NEUTRAL, 0.0, "Insufficient data")
-
-        # Dynamic column lookup (pandas-ta versions vary in naming)
-        upper_col = [c for c in bb.columns if c.startswith("BBU_")][0]
-        lower_col = [c for c in bb.columns if c.startswith("BBL_")][0]
-        mid_col = [c for c in bb.columns if c.startswith("BBM_")][0]
-
-        close = df["close"].iloc[-1]
-        prev_close = df["close"].iloc[-2]
-        upper = bb[upper_col].iloc[-1]
-        lower = bb[lower_col].iloc[-1]
-        mid = bb[mid_col].iloc[-1]
-        prev_lower = bb[lower_col].iloc[-2]
-        prev_upper = bb[upper_col].iloc[-2]
-
-        band_width = upper - lower
-        if band_width == 0:
-            return IndicatorResult(name, Direction.NEUTRAL, 0.0, "Zero bandwidth")
-
-        # Bounce off lower band
-        if prev_close <= prev_lower and close > lower:
-            position = (close - lower) / band_width
-            conf = min(position * 2, 1.0)
-            return IndicatorResult(name, Direction.LONG, max(conf, 0.6),
-                                   f"Price bouncing off lower BB")
-
-        # Rejection from upper band
-        if prev_close >= prev_upper and close < upper:
-            position = (upper - close) / band_width
-            conf = min(position * 2, 1.0)
-            return IndicatorResult(name, Direction.SHORT, max(conf, 0.6),
-                                   f"Price rejected from upper BB")
-
-        # Price below lower band (extreme oversold)
-        if close < lower:
-            distance = (lower - close) / band_width
-            return IndicatorResult(name, Direction.LONG, min(distance * 3, 0.8),
-                                   f"Price below lower BB (oversold)")
-
-        # Price above upper band (extreme overbought)
-        if close > upper:
-            distance = (close - upper) / band_width
-            return IndicatorResult(name, Direction.SHORT, min(distance * 3, 0.8),
-                                   f"Price above upper BB (overbought)")
+        if len(data) < 2:
+            return _neutral(name, "Insufficient data")
 
-        return IndicatorResult(name, Direction.NEUTRAL, 0.0,
-                               "Price within Bollinger Bands")
+        close = data.close
+        (prev_lower, prev_upper), (lower, upper) = fast_ta.bbands_last2(
+            close, config.BB_PERIOD, config.BB_STD
+        )
+        return _decide_bollinger(close[-2], close[-1], prev_lower, lower, prev_upper, upper)
 
     except Exception as e:
-        logger.error(f"Bollinger Bands error: {e}")
+        logger.exception("Bollinger Bands error: %s", e)
         return IndicatorResult(name, Direction.NEUTRAL, 0.0, f"Error: {e}")
 
 
-def calculate_stochastic_rsi(df: pd.DataFrame) -> IndicatorResult:
+def _decide_stochastic_rsi(prev_k: float, curr_k: float,
+                           prev_d: float, curr_d: float) -> IndicatorResult:
+    direction, conf, branch = _k.stochrsi_decide(
+        prev_k, curr_k, prev_d, curr_d,
+        float(config.STOCH_RSI_OVERSOLD), float(config.STOCH_RSI_OVERBOUGHT),
+    )
+    return _result("Stoch RSI", direction, conf, branch, k=curr_k)
+
+
+@bar_cache
+def calculate_stochastic_rsi(data: OHLCV) -> IndicatorResult:
     """
     Stochastic RSI.
     LONG  — %K crosses above %D in oversold zone
@@ -250,55 +432,30 @@ def calculate_stochastic_rsi(df: pd.DataFrame) -> IndicatorResult:
     """
     name = "Stoch RSI"
     try:
-        stoch = ta.stochrsi(df["close"],
-                            length=config.STOCH_RSI_PERIOD,
-                            rsi_length=config.STOCH_RSI_PERIOD,
-                            k=config.STOCH_RSI_K,
-                            d=config.STOCH_RSI_D)
-        if stoch is None or len(stoch) < 2:
-            return IndicatorResult(name, Direction.NEUTRAL, 0.0, "Insufficient data")
-
-        k_col = f"STOCHRSIk_{config.STOCH_RSI_PERIOD}_{config.STOCH_RSI_PERIOD}_{config.STOCH_RSI_K}_{config.STOCH_RSI_D}"
-        d_col = f"STOCHRSId_{config.STOCH_RSI_PERIOD}_{config.STOCH_RSI_PERIOD}_{config.STOCH_RSI_K}_{config.STOCH_RSI_D}"
-
-        curr_k = stoch[k_col].iloc[-1]
-        prev_k = stoch[k_col].iloc[-2]
-        curr_d = stoch[d_col].iloc[-1]
-        prev_d = stoch[d_col].iloc[-2]
-
-        # Bullish crossover in oversold zone
-        if (prev_k <= prev_d and curr_k > curr_d and
-                curr_k < config.STOCH_RSI_OVERSOLD + 10):
-            conf = min((config.STOCH_RSI_OVERSOLD + 10 - curr_k) / 20, 1.0)
-            return IndicatorResult(name, Direction.LONG, max(conf, 0.6),
-                                   f"StochRSI bullish crossover in oversold ({curr_k:.0f})")
-
-        # Bearish crossover in overbought zone
-        if (prev_k >= prev_d and curr_k < curr_d and
-                curr_k > config.STOCH_RSI_OVERBOUGHT - 10):
-            conf = min((curr_k - config.STOCH_RSI_OVERBOUGHT + 10) / 20, 1.0)
-            return IndicatorResult(name, Direction.SHORT, max(conf, 0.6),
-                                   f"StochRSI bearish crossover in overbought ({curr_k:.0f})")
-
-        # Deep oversold
-        if curr_k < config.STOCH_RSI_OVERSOLD:
-            return IndicatorResult(name, Direction.LONG, 0.4,
-                                   f"StochRSI oversold ({curr_k:.0f})")
-
-        # Deep overbought
-        if curr_k > config.STOCH_RSI_OVERBOUGHT:
-            return IndicatorResult(name, Direction.SHORT, 0.4,
-                                   f"StochRSI overbought ({curr_k:.0f})")
+        if len(data) < 2:
+            return _neutral(name, "Insufficient data")
 
-        return IndicatorResult(name, Direction.NEUTRAL, 0.0,
-                               f"StochRSI neutral ({curr_k:.0f})")
+        (prev_k, prev_d), (curr_k, curr_d) = fast_ta.stochrsi_last2(
+            data.close,
+            config.STOCH_RSI_PERIOD, config.STOCH_RSI_PERIOD,
+            config.STOCH_RSI_K, config.STOCH_RSI_D,
+        )
+        return _decide_stochastic_rsi(prev_k, curr_k, prev_d, curr_d)
 
     except Exception as e:
-        logger.error(f"Stoch RSI error: {e}")
+        logger.exception("Stoch RSI error: %s", e)
         return IndicatorResult(name, Direction.NEUTRAL, 0.0, f"Error: {e}")
 
 
-def calculate_adx(df: pd.DataFrame) -> IndicatorResult:
+def _decide_adx(adx_val: float, plus_di: float, minus_di: float) -> IndicatorResult:
+    direction, conf, branch = _k.adx_decide(
+        adx_val, plus_di, minus_di, float(config.ADX_THRESHOLD)
+    )
+    return _result("ADX", direction, conf, branch, adx=adx_val, plus=plus_di, minus=minus_di)
+
+
+@bar_cache
+def calculate_adx(data: OHLCV) -> IndicatorResult:
     """
     ADX + Directional Indicators (DI+ / DI-).
     LONG  — ADX > threshold and +DI > -DI
@@ -306,94 +463,88 @@ def calculate_adx(df: pd.DataFrame) -> IndicatorResult:
     """
     name = "ADX"
     try:
-        adx_df = ta.adx(df["high"], df["low"], df["close"], length=config.ADX_PERIOD)
-        if adx_df is None or len(adx_df) < 1:
-            return IndicatorResult(name, Direction.NEUTRAL, 0.0, "Insufficient data")
+        if len(data) < 1:
+            return _neutral(name, "Insufficient data")
+
+        return _decide_adx(*_adx_last(data, config.ADX_PERIOD))
 
-        adx_col = f"ADX_{config.ADX_PERIOD}"
-        dmp_col = f"DMP_{config.ADX_PERIOD}"
-        dmn_col = f"DMN_{config.ADX_PERIOD}"
+    except Exception as e:
+        logger.exception("ADX error: %s", e)
+        return IndicatorResult(name, Direction.NEUTRAL, 0.0, f"Error: {e}")
 
-        adx_val = adx_df[adx_col].iloc[-1]
-        plus_di = adx_df[dmp_col].iloc[-1]
-        minus_di = adx_df[dmn_col].iloc[-1]
 
-        if adx_val < config.ADX_THRESHOLD:
-            return IndicatorResult(name, Direction.NEUTRAL, 0.0,
-                                   f"ADX weak trend ({adx_val:.1f} < {config.ADX_THRESHOLD})")
+def _decide_volume(curr_vol: float, avg_vol: float, price_change: float) -> IndicatorResult:
+    name = "Volume"
 
-        # Strong trend detected
-        conf = min((adx_val - config.ADX_THRESHOLD) / 25, 1.0)
+    if avg_vol == 0:
+        return _neutral(name, "Zero average volume")
 
-        if plus_di > minus_di:
-            di_gap = plus_di - minus_di
-            conf = min(conf + di_gap / 30, 1.0)
+    vol_ratio = curr_vol / avg_vol
+
+    if vol_ratio >= config.VOLUME_MULTIPLIER:
+        # Volume spike detected — direction determined by price action
+        conf = min((vol_ratio - 1.0) / 2.0, 1.0)
+
+        if price_change > 0:
             return IndicatorResult(name, Direction.LONG, conf,
-                                   f"ADX {adx_val:.0f} bullish (+DI {plus_di:.0f} > -DI {minus_di:.0f})")
-        else:
-            di_gap = minus_di - plus_di
-            conf = min(conf + di_gap / 30, 1.0)
+                                   "Volume spike {ratio:.1f}x (bullish)", {"ratio": vol_ratio})
+        elif price_change < 0:
             return IndicatorResult(name, Direction.SHORT, conf,
-                                   f"ADX {adx_val:.0f} bearish (-DI {minus_di:.0f} > +DI {plus_di:.0f})")
+                                   "Volume spike {ratio:.1f}x (bearish)", {"ratio": vol_ratio})
+        else:
+            return IndicatorResult(name, Direction.NEUTRAL, conf,
+                                   "Volume spike {ratio:.1f}x (neutral price)", {"ratio": vol_ratio})
 
-    except Exception as e:
-        logger.error(f"ADX error: {e}")
-        return IndicatorResult(name, Direction.NEUTRAL, 0.0, f"Error: {e}")
+    return IndicatorResult(name, Direction.NEUTRAL, 0.0,
+                           "Normal volume ({ratio:.1f}x avg)", {"ratio": vol_ratio})
 
 
-def calculate_volume(df: pd.DataFrame) -> IndicatorResult:
+@bar_cache
+def calculate_volume(data: OHLCV) -> IndicatorResult:
     """
     Volume analysis.
     Confirms signals when current volume is significantly above average.
     """
     name = "Volume"
     try:
-        vol = df["volume"]
-        if len(vol) < 20:
-            return IndicatorResult(name, Direction.NEUTRAL, 0.0, "Insufficient data")
-
-        curr_vol = vol.iloc[-1]
-        avg_vol = vol.iloc[-20:].mean()
-
-        if avg_vol == 0:
-            return IndicatorResult(name, Direction.NEUTRAL, 0.0, "Zero average volume")
-
-        vol_ratio = curr_vol / avg_vol
-
-        if vol_ratio >= config.VOLUME_MULTIPLIER:
-            # Volume spike detected — direction determined by price action
-            price_change = df["close"].iloc[-1] - df["close"].iloc[-2]
-            conf = min((vol_ratio - 1.0) / 2.0, 1.0)
+        if len(data) < 20:
+            return _neutral(name, "Insufficient data")
 
-            if price_change > 0:
-                return IndicatorResult(name, Direction.LONG, conf,
-                                       f"Volume spike {vol_ratio:.1f}x (bullish)")
-            elif price_change < 0:
-                return IndicatorResult(name, Direction.SHORT, conf,
-                                       f"Volume spike {vol_ratio:.1f}x (bearish)")
-            else:
-                return IndicatorResult(name, Direction.NEUTRAL, conf,
-                                       f"Volume spike {vol_ratio:.1f}x (neutral price)")
-
-        return IndicatorResult(name, Direction.NEUTRAL, 0.0,
-                               f"Normal volume ({vol_ratio:.1f}x avg)")
+        close = data.close
+        return _decide_volume(data.volume[-1], _volume_avg(data, 20), close[-1] - close[-2])
 
     except Exception as e:
-        logger.error(f"Volume error: {e}")
+        logger.exception("Volume error: %s", e)
         return IndicatorResult(name, Direction.NEUTRAL, 0.0, f"Error: {e}")
 
 
-def calculate_atr(df: pd.DataFrame) -> Optional[float]:
+@bar_cache
+def calculate_atr(data: OHLCV) -> Optional[float]:
     """Calculate ATR for stop-loss / take-profit levels."""
     try:
-        atr = ta.atr(df["high"], df["low"], df["close"], length=config.ATR_PERIOD)
-        if atr is not None and len(atr) > 0:
-            return float(atr.iloc[-1])
+        if len(data) >= 2:
+            atr = _atr_last(data, config.ATR_PERIOD)
+            if not math.isnan(atr):
+                return atr
     except Exception as e:
-        logger.error(f"ATR error: {e}")
+        logger.exception("ATR error: %s", e)
     return None
 
 
+# |rate| buckets: 0 = neutral, 1 = high (> 0.05%), 2 = extreme (> 0.1%).
+# Positive funding → too many longs → SHORT; negative → too many shorts → LONG.
+_FUNDING_LEVELS = (0.0005, 0.001)
+_FUNDING_LADDER = {
+    # bucket: (level, span, cap, floor, positive-rate text, negative-rate text)
+    1: (0.0005, 0.001, 0.7, 0.4,
+        "High positive funding ({pct:.4f}%) — longs overcrowded",
+        "High negative funding ({pct:.4f}%) — shorts overcrowded"),
+    2: (0.001, 0.002, 1.0, 0.7,
+        "Extreme positive funding ({pct:.4f}%) — shorts squeezed out",
+        "Extreme negative funding ({pct:.4f}%) — longs squeezed out"),
+}
+
+
 def calculate_funding_rate(funding_data: dict) -> IndicatorResult:
     """
     Funding Rate analysis.
@@ -403,35 +554,22 @@ def calculate_funding_rate(funding_data: dict) -> IndicatorResult:
     name = "Funding Rate"
     try:
         if not funding_data:
-            return IndicatorResult(name, Direction.NEUTRAL, 0.0, "No funding data")
+            return _neutral(name, "No funding data")
 
         rate = funding_data["funding_rate"]
+        bucket = bisect.bisect_left(_FUNDING_LEVELS, abs(rate))
+        if bucket == 0:
+            return IndicatorResult(name, Direction.NEUTRAL, 0.0,
+                                   "Funding neutral ({pct:.4f}%)", {"pct": rate * 100})
 
-        # Extreme positive funding (> 0.05% = 0.0005) — too many longs
-        if rate > 0.001:  # > 0.1%
-            conf = min((rate - 0.001) / 0.002, 1.0)
-            return IndicatorResult(name, Direction.SHORT, max(conf, 0.7),
-                                   f"Extreme positive funding ({rate*100:.4f}%) — shorts squeezed out")
-        elif rate > 0.0005:  # > 0.05%
-            conf = min((rate - 0.0005) / 0.001, 0.7)
-            return IndicatorResult(name, Direction.SHORT, max(conf, 0.4),
-                                   f"High positive funding ({rate*100:.4f}%) — longs overcrowded")
-
-        # Extreme negative funding (< -0.05%) — too many shorts
-        elif rate < -0.001:  # < -0.1%
-            conf = min((abs(rate) - 0.001) / 0.002, 1.0)
-            return IndicatorResult(name, Direction.LONG, max(conf, 0.7),
-                                   f"Extreme negative funding ({rate*100:.4f}%) — longs squeezed out")
-        elif rate < -0.0005:  # < -0.05%
-            conf = min((abs(rate) - 0.0005) / 0.001, 0.7)
-            return IndicatorResult(name, Direction.LONG, max(conf, 0.4),
-                                   f"High negative funding ({rate*100:.4f}%) — shorts overcrowded")
-
-        return IndicatorResult(name, Direction.NEUTRAL, 0.0,
-                               f"Funding neutral ({rate*100:.4f}%)")
+        level, span, cap, floor, short_text, long_text = _FUNDING_LADDER[bucket]
+        conf = max(min((abs(rate) - level) / span, cap), floor)
+        if rate > 0:
+            return IndicatorResult(name, Direction.SHORT, conf, short_text, {"pct": rate * 100})
+        return IndicatorResult(name, Direction.LONG, conf, long_text, {"pct": rate * 100})
 
     except Exception as e:
-        logger.error(f"Funding rate error: {e}")
+        logger.exception("Funding rate error: %s", e)
         return IndicatorResult(name, Direction.NEUTRAL, 0.0, f"Error: {e}")
 
 
@@ -445,15 +583,16 @@ def calculate_open_interest(oi_data: dict, price_change_pct: float) -> Indicator
     """
     name = "Open Interest"
     try:
-        if not oi_data or not oi_data.get("oi_values") or len(oi_data["oi_values"]) < 10:
-            return IndicatorResult(name, Direction.NEUTRAL, 0.0, "No OI data")
+        values = oi_data.get("oi_values") if oi_data else None
+        values = np.asarray(() if values is None else values, dtype=np.float64)
+        if values.shape[0] < 10:
+            return _neutral(name, "No OI data")
 
-        values = oi_data["oi_values"]
-        recent_avg = sum(values[-5:]) / 5
-        older_avg = sum(values[:5]) / 5
+        recent_avg = values[-5:].mean()
+        older_avg = values[:5].mean()
 
         if older_avg == 0:
-            return IndicatorResult(name, Direction.NEUTRAL, 0.0, "Zero OI")
+            return _neutral(name, "Zero OI")
 
         oi_change_pct = (recent_avg - older_avg) / older_avg * 100
 
@@ -481,7 +620,7 @@ def calculate_open_interest(oi_data: dict, price_change_pct: float) -> Indicator
                                f"OI stable ({oi_change_pct:+.1f}%)")
 
     except Exception as e:
-        logger.error(f"OI error: {e}")
+        logger.exception("OI error: %s", e)
         return IndicatorResult(name, Direction.NEUTRAL, 0.0, f"Error: {e}")
 
 
@@ -496,60 +635,60 @@ def analyze_support_resistance(
     name = "S/R Levels"
     try:
         if not sr_data:
-            return IndicatorResult(name, Direction.NEUTRAL, 0.0, "No S/R data")
+            return _neutral(name, "No S/R data")
 
         price = sr_data["current_price"]
-        supports = sr_data.get("support", [])
-        resistances = sr_data.get("resistance", [])
+        sup_px = sr_data["support_sorted"]
+        res_px = sr_data["resistance_sorted"]
         proximity_threshold = atr * 1.0  # Within 1 ATR of a level
 
-        # Check nearest resistance
-        if resistances:
-            nearest_res_price, nearest_res_strength = min(resistances, key=lambda x: x[0] - price)
+        # Nearest levels by binary search: highest support below price,
+        # lowest resistance above it
+        sup_idx = int(np.searchsorted(sup_px, price, side="left")) - 1
+        res_idx = int(np.searchsorted(res_px, price, side="right"))
+        has_sup = sup_idx >= 0
+        has_res = res_idx < len(res_px)
+        if has_sup:
+            nearest_sup_price = float(sup_px[sup_idx])
+            nearest_sup_strength = int(sr_data["support_strength"][sup_idx])
+            dist_to_sup = price - nearest_sup_price
+        if has_res:
+            nearest_res_price = float(res_px[res_idx])
+            nearest_res_strength = int(sr_data["resistance_strength"][res_idx])
             dist_to_res = nearest_res_price - price
 
-            if direction == Direction.LONG and dist_to_res < proximity_threshold:
-                conf = min(nearest_res_strength / 3, 0.8)
-                return IndicatorResult(name, Direction.SHORT, conf,
-                                       f"⚠️ Resistance at {nearest_res_price:.2f} ({nearest_res_strength} touches) within {dist_to_res:.0f}")
+        # Check nearest resistance
+        if has_res and direction == Direction.LONG and dist_to_res < proximity_threshold:
+            conf = min(nearest_res_strength / 3, 0.8)
+            return IndicatorResult(name, Direction.SHORT, conf,
+                                   f"⚠️ Resistance at {nearest_res_price:.2f} ({nearest_res_strength} touches) within {dist_to_res:.0f}")
 
         # Check nearest support
-        if supports:
-            nearest_sup_price, nearest_sup_strength = max(supports, key=lambda x: x[0])
-            dist_to_sup = price - nearest_sup_price
-
-            if direction == Direction.SHORT and dist_to_sup < proximity_threshold:
-                conf = min(nearest_sup_strength / 3, 0.8)
-                return IndicatorResult(name, Direction.LONG, conf,
-                                       f"⚠️ Support at {nearest_sup_price:.2f} ({nearest_sup_strength} touches) within {dist_to_sup:.0f}")
+        if has_sup and direction == Direction.SHORT and dist_to_sup < proximity_threshold:
+            conf = min(nearest_sup_strength / 3, 0.8)
+            return IndicatorResult(name, Direction.LONG, conf,
+                                   f"⚠️ Support at {nearest_sup_price:.2f} ({nearest_sup_strength} touches) within {dist_to_sup:.0f}")
 
         # Price near support + LONG = confirming
-        if supports and direction == Direction.LONG:
-            nearest_sup_price, nearest_sup_strength = max(supports, key=lambda x: x[0])
-            dist_to_sup = price - nearest_sup_price
-            if dist_to_sup < proximity_threshold * 2:
-                conf = min(nearest_sup_strength / 4, 0.6)
-                return IndicatorResult(name, Direction.LONG, conf,
-                                       f"Near support {nearest_sup_price:.2f} ({nearest_sup_strength}x) — bounce zone")
+        if has_sup and direction == Direction.LONG and dist_to_sup < proximity_threshold * 2:
+            conf = min(nearest_sup_strength / 4, 0.6)
+            return IndicatorResult(name, Direction.LONG, conf,
+                                   f"Near support {nearest_sup_price:.2f} ({nearest_sup_strength}x) — bounce zone")
 
         # Price near resistance + SHORT = confirming
-        if resistances and direction == Direction.SHORT:
-            nearest_res_price, nearest_res_strength = min(resistances, key=lambda x: x[0] - price)
-            dist_to_res = nearest_res_price - price
-            if dist_to_res < proximity_threshold * 2:
-                conf = min(nearest_res_strength / 4, 0.6)
-                return IndicatorResult(name, Direction.SHORT, conf,
-                                       f"Near resistance {nearest_res_price:.2f} ({nearest_res_strength}x) — rejection zone")
+        if has_res and direction == Direction.SHORT and dist_to_res < proximity_threshold * 2:
+            conf = min(nearest_res_strength / 4, 0.6)
+            return IndicatorResult(name, Direction.SHORT, conf,
+                                   f"Near resistance {nearest_res_price:.2f} ({nearest_res_strength}x) — rejection zone")
 
-        return IndicatorResult(name, Direction.NEUTRAL, 0.0,
-                               "Price away from key S/R levels")
+        return _neutral(name, "Price away from key S/R levels")
 
     except Exception as e:
-        logger.error(f"S/R error: {e}")
+        logger.exception("S/R error: %s", e)
         return IndicatorResult(name, Direction.NEUTRAL, 0.0, f"Error: {e}")
 
 
-# Standard indicator functions (take only DataFrame)
+# Standard indicator functions (take only OHLCV)
 ALL_INDICATORS = [
     calculate_ema_cross,
     calculate_rsi,
@@ -566,3 +705,23 @@ TREND_INDICATORS = [
     calculate_macd,
     calculate_adx,
 ]
+
+
+# ── Parallel evaluation ────────────────────────────────
+# The indicators are independent and their numeric work runs in numpy or in
+# nogil Numba kernels, so a small shared pool evaluates them side by side.
+# With a single CPU the pool is skipped entirely.
+_WORKERS = min(len(ALL_INDICATORS), os.cpu_count() or 1)
+_POOL = ThreadPoolExecutor(max_workers=_WORKERS, thread_name_prefix="indicator") if _WORKERS > 1 else None
+
+
+def run_parallel(calls: list) -> list:
+    """Call each zero-argument callable; results come back in input order."""
+    if _POOL is None:
+        return [call() for call in calls]
+    return list(_POOL.map(lambda call: call(), calls))
+
+
+def run_all(data: OHLCV, indicators: list = ALL_INDICATORS) -> list[IndicatorResult]:
+    """Evaluate `indicators` on data through the shared pool."""
+    return run_parallel([lambda fn=fn: fn(data) for fn in indicators])
@@ -5,16 +5,20 @@ v4: Auto-trading via Bybit API + exit tracking + marathon.
 
 import asyncio
 import logging
+import math
 import os
 import signal as os_signal
 import sys
 import threading
-from datetime import datetime, timezone, timedelta
+import time
+from datetime import datetime, timezone
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from typing import Optional
 
+from telegram.ext import Application
+
 import config
-from data_fetcher import DataFetcher
+from data_fetcher import DataFetcher, WSDataFetcher
 from signal_engine import SignalEngine, Signal
 from telegram_bot import TelegramSignalBot
 from exit_tracker import ExitTracker, TrackedPosition
@@ -44,154 +48,203 @@ def signal_to_tracked(signal: Signal) -> TrackedPosition:
     )
 
 
-# Trade cooldown tracker (symbol -> last trade time)
-_trade_cooldowns: dict[str, datetime] = {}
+# Trade cooldown tracker (symbol -> time.monotonic() of the last trade)
+_trade_cooldowns: dict[str, float] = {}
+
+
+async def run_every(interval_s: float, stop_event: asyncio.Event, job, *args):
+    """
+    Await job(*args) every interval_s seconds on a fixed schedule until
+    stop_event is set. Each start is planned from the previous one, so the
+    period doesn't drift by the job's own run time; a run that overshoots
+    skips the slots it missed. The wait between runs ends as soon as
+    stop_event is set; a run already in progress is allowed to finish.
+    Because runs are interval_s apart start-to-start, a job must not reuse
+    anything it cached for about interval_s — the next run would still
+    find it fresh (exit checks rely on the short PRICE_CACHE_TTL_SECONDS).
+    """
+    loop = asyncio.get_running_loop()
+    next_run = loop.time()
+    while not stop_event.is_set():
+        await job(*args)
+        now = loop.time()
+        next_run += interval_s
+        if next_run < now:
+            next_run += math.ceil((now - next_run) / interval_s) * interval_s
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=next_run - now)
+        except asyncio.TimeoutError:
+            pass
 
 
-async def scan_loop(
+async def scan_once(
     engine: SignalEngine,
     bot: TelegramSignalBot,
     tracker: ExitTracker,
     trader: Optional[BybitTrader] = None,
 ):
-    """Main scan loop — runs every SCAN_INTERVAL_MINUTES."""
-    while True:
-        try:
-            now = datetime.now(timezone.utc)
-            logger.info("═" * 50)
-            logger.info(f"🔍 Scan cycle started at {now.strftime('%H:%M:%S')} UTC")
-            logger.info(f"   Pairs: {len(config.TRADING_PAIRS)} | Threshold: {config.SIGNAL_THRESHOLD}/100")
-            if trader:
-                logger.info(f"   💱 Auto-trade: ON | Open: {len(trader.get_open_positions())}/{config.MAX_OPEN_POSITIONS}")
-            logger.info("═" * 50)
-
-            signals = engine.scan_all()
-
-            if signals:
-                sent = await bot.send_signals(signals)
-                logger.info(f"📤 Sent {sent}/{len(signals)} signals")
-
-                for signal in signals:
-                    # Track for exit management
-                    position = signal_to_tracked(signal)
-                    tracker.add_position(position)
-
-                    # Auto-trade if enabled
-                    if trader and config.AUTO_TRADE_ENABLED:
-                        open_count = len(trader.get_open_positions())
-                        if open_count >= config.MAX_OPEN_POSITIONS:
-                            logger.info(
-                                f"⚠️ Max positions ({config.MAX_OPEN_POSITIONS}) reached, "
-                                f"skipping {signal.symbol}"
-                            )
-                            await bot.send_status_message(
-                                f"⚠️ *Макс позицій ({config.MAX_OPEN_POSITIONS})* — "
-                                f"{signal.symbol} пропущено"
-                            )
-                            continue
-
-                        # Guard: skip if already in a position for this symbol
-                        if trader.get_position_for_symbol(signal.symbol):
+    """One scan cycle — scheduled every SCAN_INTERVAL_MINUTES."""
+    try:
+        now = datetime.now(timezone.utc)
+        now_mono = time.monotonic()
+
+        # Drop cooldowns that have run out so the dict stays bounded
+        cooldown = config.SIGNAL_COOLDOWN_MINUTES * 60
+        for symbol in [s for s, t in _trade_cooldowns.items() if now_mono - t >= cooldown]:
+            del _trade_cooldowns[symbol]
+
+        logger.info("═" * 50)
+        logger.info(f"🔍 Scan cycle started at {now.strftime('%H:%M:%S')} UTC")
+        logger.info(f"   Pairs: {len(config.TRADING_PAIRS)} | Threshold: {config.SIGNAL_THRESHOLD}/100")
+        if trader:
+            logger.info(f"   💱 Auto-trade: ON | Open: {len(await trader.get_open_positions())}/{config.MAX_OPEN_POSITIONS}")
+        logger.info("═" * 50)
+
+        signals = await engine.scan_all()
+
+        if signals:
+            sent = await bot.send_signals(signals, now)
+            logger.info(f"📤 Sent {sent}/{len(signals)} signals")
+
+            for signal in signals:
+                # Track for exit management
+                position = signal_to_tracked(signal)
+                tracker.add_position(position)
+
+                # Auto-trade if enabled
+                if trader and config.AUTO_TRADE_ENABLED:
+                    open_count = len(await trader.get_open_positions())
+                    if open_count >= config.MAX_OPEN_POSITIONS:
+                        logger.info(
+                            f"⚠️ Max positions ({config.MAX_OPEN_POSITIONS}) reached, "
+                            f"skipping {signal.symbol}"
+                        )
+                        await bot.send_status_message(
+                            f"⚠️ *Макс позицій ({config.MAX_OPEN_POSITIONS})* — "
+                            f"{signal.symbol} пропущено"
+                        )
+                        continue
+
+                    # Guard: skip if already in a position for this symbol
+                    if await trader.get_position_for_symbol(signal.symbol):
+                        logger.info(
+                            f"⏭ {signal.symbol} — позиція вже відкрита, пропускаю"
+                        )
+                        continue
+
+                    # Cooldown: skip if traded this symbol recently
+                    if signal.symbol in _trade_cooldowns:
+                        elapsed = now_mono - _trade_cooldowns[signal.symbol]
+                        if elapsed < cooldown:
                             logger.info(
-                                f"⏭ {signal.symbol} — позиція вже відкрита, пропускаю"
+                                f"⏭ {signal.symbol} — trade cooldown "
+                                f"({int(elapsed // 60)}m / {config.SIGNAL_COOLDOWN_MINUTES}m)"
                             )
                             continue
 
-                        # Cooldown: skip if traded this symbol recently
-                        now_ts = datetime.now(timezone.utc)
-                        if signal.symbol in _trade_cooldowns:
-                            elapsed = now_ts - _trade_cooldowns[signal.symbol]
-                            if elapsed < timedelta(minutes=config.SIGNAL_COOLDOWN_MINUTES):
-                                logger.info(
-                                    f"⏭ {signal.symbol} — trade cooldown "
-                                    f"({elapsed.seconds // 60}m / {config.SIGNAL_COOLDOWN_MINUTES}m)"
-                                )
-                                continue
-
-                        result = trader.open_position(signal)
-                        if result:
-                            _trade_cooldowns[signal.symbol] = datetime.now(timezone.utc)
-                            await bot.send_status_message(
-                                f"💱 *ОРДЕР ВИКОНАНО*\n\n"
-                                f"📊 {result['symbol']} {result['side'].upper()}\n"
-                                f"💰 Ціна: `{result['fill_price']:,.2f}`\n"
-                                f"📏 Кількість: `{result['amount']}`\n"
-                                f"💼 Розмір: `${result['position_usd']:.2f}`\n"
-                                f"⚡ Плече: {result['leverage']}x\n"
-                                f"🛑 SL: `{result['sl']:,.2f}`\n"
-                                f"🎯 TP: `{result['tp2']:,.2f}`"
-                            )
-                        else:
-                            await bot.send_status_message(
-                                f"❌ Не вдалося відкрити {signal.symbol}"
-                            )
-            else:
-                logger.info("😴 No signals this cycle")
+                    result = await trader.open_position(signal)
+                    if result:
+                        _trade_cooldowns[signal.symbol] = time.monotonic()
+                        await bot.send_status_message(
+                            f"💱 *ОРДЕР ВИКОНАНО*\n\n"
+                            f"📊 {result['symbol']} {result['side'].upper()}\n"
+                            f"💰 Ціна: `{result['fill_price']:,.2f}`\n"
+                            f"📏 Кількість: `{result['amount']}`\n"
+                            f"💼 Розмір: `${result['position_usd']:.2f}`\n"
+                            f"⚡ Плече: {result['leverage']}x\n"
+                            f"🛑 SL: `{result['sl']:,.2f}`\n"
+                            f"🎯 TP: `{result['tp2']:,.2f}`"
+                        )
+                    else:
+                        await bot.send_status_message(
+                            f"❌ Не вдалося відкрити {signal.symbol}"
+                        )
+        else:
+            logger.info("😴 No signals this cycle")
 
-        except Exception as e:
-            logger.error(f"Scan loop error: {e}", exc_info=True)
+    except Exception as e:
+        logger.error(f"Scan loop error: {e}", exc_info=True)
 
-        logger.info(f"⏳ Next scan in {config.SCAN_INTERVAL_MINUTES} minutes...")
-        await asyncio.sleep(config.SCAN_INTERVAL_MINUTES * 60)
+    logger.info(f"⏳ Next scan in {config.SCAN_INTERVAL_MINUTES} minutes...")
 
 
-async def exit_check_loop(bot: TelegramSignalBot, tracker: ExitTracker, fetcher: DataFetcher, marathon: MarathonTracker):
-    """Exit tracking loop — checks open positions for SL/TP/time exits."""
-    while True:
-        try:
-            if tracker.position_count > 0:
-                logger.debug(f"🔒 Checking {tracker.position_count} open position(s)...")
-
-                def price_getter(symbol: str):
-                    return fetcher.get_current_price(symbol)
-
-                alerts = tracker.check_exits(price_getter)
-
-                for alert in alerts:
-                    await bot.send_exit_alert(alert)
-
-                    # Record in marathon tracker
-                    pos = alert.position
-                    trade = marathon.record_trade(
-                        symbol=pos.symbol,
-                        direction=pos.direction,
-                        entry_price=pos.entry_price,
-                        exit_price=alert.current_price,
-                        pnl_pct=alert.pnl_pct,
-                        position_size_pct=pos.position_size_pct,
-                        score=pos.score,
-                        exit_reason=alert.reason.value,
-                    )
-
-                    # Send marathon update
-                    marathon_msg = marathon.format_trade_message(trade)
-                    await bot.send_status_message(marathon_msg)
-
-                    logger.info(
-                        f"📤 Exit alert: {pos.symbol} "
-                        f"{alert.reason.value} PnL={alert.pnl_pct:+.2f}% "
-                        f"| Marathon: ${marathon.current_balance:.2f}"
-                    )
+async def exit_check_once(bot: TelegramSignalBot, tracker: ExitTracker, fetcher: DataFetcher, marathon: MarathonTracker):
+    """One exit check — SL/TP/time exits for open positions, every EXIT_CHECK_INTERVAL_MINUTES."""
+    try:
+        if tracker.position_count > 0:
+            logger.debug(f"🔒 Checking {tracker.position_count} open position(s)...")
+
+            symbols = [p.symbol for p in tracker.open_positions]
+            prices = await fetcher.fetch_all_prices(symbols)
+
+            alerts = tracker.check_exits(prices)
+
+            for alert in alerts:
+                await bot.send_exit_alert(alert)
+
+                # Record in marathon tracker
+                pos = alert.position
+                trade = marathon.record_trade(
+                    symbol=pos.symbol,
+                    direction=pos.direction,
+                    entry_price=pos.entry_price,
+                    exit_price=alert.current_price,
+                    pnl_pct=alert.pnl_pct,
+                    position_size_pct=pos.position_size_pct,
+                    score=pos.score,
+                    exit_reason=alert.reason.label,
+                )
+                # Disk writes go to a worker thread so the event loop keeps running
+                await asyncio.to_thread(marathon.save_trade, trade)
+
+                # Send marathon update
+                marathon_msg = marathon.format_trade_message(trade)
+                await bot.send_status_message(marathon_msg)
+
+                logger.info(
+                    f"📤 Exit alert: {pos.symbol} "
+                    f"{alert.reason.label} PnL={alert.pnl_pct:+.2f}% "
+                    f"| Marathon: ${marathon.current_balance:.2f}"
+                )
 
-        except Exception as e:
-            logger.error(f"Exit check error: {e}", exc_info=True)
+    except Exception as e:
+        logger.error(f"Exit check error: {e}", exc_info=True)
 
-        await asyncio.sleep(config.EXIT_CHECK_INTERVAL_MINUTES * 60)
 
 
-async def telegram_polling(bot: TelegramSignalBot):
-    """Run Telegram bot command polling."""
+async def telegram_polling(bot: TelegramSignalBot) -> Application:
+    """Start Telegram bot command polling; returns the running application."""
     app = bot.build_application()
     await app.initialize()
     await app.start()
-    await app.updater.start_polling(drop_pending_updates=True)
+    # Long-poll for up to 20s per getUpdates call instead of the 10s default
+    await app.updater.start_polling(drop_pending_updates=True, timeout=20, poll_interval=0.0)
     logger.info("📱 Telegram command handler started")
+    return app
+
+
+async def stop_telegram(app: Application):
+    """Stop polling and shut the Telegram application down."""
+    try:
+        if app.updater.running:
+            await app.updater.stop()
+        if app.running:
+            await app.stop()
+        await app.shutdown()
+    except Exception as e:
+        logger.error(f"Telegram shutdown error: {e}")
+
 
+async def main(stop_event: asyncio.Event):
+    """Main entry point — runs until stop_event is set."""
+    # Python 3.12+: new tasks run eagerly up to their first real suspension,
+    # so gathered cache hits finish without a round trip through the loop
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
 
-async def main():
-    """Main entry point."""
     # ── Init components ─────────────────────────────────
-    fetcher = DataFetcher()
+    fetcher_class = WSDataFetcher if config.USE_WEBSOCKET else DataFetcher
+    fetcher = await fetcher_class.create()
     engine = SignalEngine(data_fetcher=fetcher)
     tracker = ExitTracker()
     marathon = MarathonTracker(starting_balance=46.0)
@@ -200,8 +253,8 @@ async def main():
     trader: Optional[BybitTrader] = None
     if config.AUTO_TRADE_ENABLED and config.BYBIT_API_KEY:
         try:
-            trader = BybitTrader()
-            balance = trader.get_balance()
+            trader = await BybitTrader.create()
+            balance = await trader.get_balance()
             marathon.current_balance = balance
             marathon._save()
             logger.info(f"💱 Auto-trader ENABLED | Real balance: ${balance:.2f}")
@@ -264,28 +317,50 @@ async def main():
     threading.Thread(target=run_health_server, daemon=True).start()
 
     # ── Start all loops ─────────────────────────────────
-    await telegram_polling(bot)
-    await asyncio.gather(
-        scan_loop(engine, bot, tracker, trader),
-        exit_check_loop(bot, tracker, fetcher, marathon),
-    )
+    app = await telegram_polling(bot)
+    try:
+        # If either loop fails or main() is cancelled, the group cancels the other
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(run_every(
+                config.SCAN_INTERVAL_MINUTES * 60, stop_event,
+                scan_once, engine, bot, tracker, trader))
+            tg.create_task(run_every(
+                config.EXIT_CHECK_INTERVAL_MINUTES * 60, stop_event,
+                exit_check_once, bot, tracker, fetcher, marathon))
+    finally:
+        # Deliver alerts still waiting out the coalescing window
+        await bot.flush_outbox()
+        await stop_telegram(app)
+        await fetcher.close()
+        if trader:
+            await trader.close()
 
 
 if __name__ == "__main__":
+    # libuv-backed event loop when available (Linux/macOS); stock asyncio otherwise
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     # Handle graceful shutdown
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
 
+    # The handler only sets the event (thread-safely); the loops notice it,
+    # finish their current cycle and main()'s finally blocks do the teardown
+    stop_event = asyncio.Event()
+
     def shutdown_handler(sig, frame):
         logger.info(f"Received signal {sig}, shutting down...")
-        for task in asyncio.all_tasks(loop):
-            task.cancel()
+        loop.call_soon_threadsafe(stop_event.set)
 
     os_signal.signal(os_signal.SIGINT, shutdown_handler)
     os_signal.signal(os_signal.SIGTERM, shutdown_handler)
 
     try:
-        loop.run_until_complete(main())
+        loop.run_until_complete(main(stop_event))
     except (KeyboardInterrupt, asyncio.CancelledError):
         logger.info("🛑 Shutting down…")
     finally:
@@ -1,23 +1,39 @@
 """
 Marathon Tracker — tracks a challenge from starting balance, recording every trade PnL.
-Saves state to JSON so it survives restarts.
+Saves state to disk so it survives restarts: balances in a small JSON file,
+trades in an append-only JSONL ledger.
 """
 
+import bisect
+import hashlib
 import json
 import logging
-from dataclasses import dataclass, field, asdict
+import os
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+import orjson
+
 import config
 
 logger = logging.getLogger(__name__)
 
-MARATHON_FILE = Path(__file__).parent / "marathon_data.json"
+MARATHON_DIR = Path(__file__).parent
+META_FILE = MARATHON_DIR / "marathon_meta.json"
+LEDGER_FILE = MARATHON_DIR / "marathon_trades.jsonl"
+LEGACY_FILE = MARATHON_DIR / "marathon_data.json"   # single-file format, migrated on load
+
+# Balance targets, ascending — looked up with bisect
+MILESTONES = (100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Progress-bar cells, sliced per render (bars are at most this wide)
+_BAR_FULL = "█" * 32
+_BAR_EMPTY = "░" * 32
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """A single trade record."""
     symbol: str
@@ -44,37 +60,86 @@ class MarathonTracker:
         self.starting_balance = starting_balance
         self.current_balance = starting_balance
         self.trades: list[Trade] = []
-        self.started_at: str = datetime.now(timezone.utc).isoformat()
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        # Digest of the meta file as last read/written — identical saves are skipped
+        self._saved_digest: Optional[bytes] = None
         self._load()
+        self._rebuild_stats()
+
+    @property
+    def started_at(self) -> str:
+        """Start time as an ISO string (the persisted form)."""
+        return self._started_at
+
+    @started_at.setter
+    def started_at(self, value: str):
+        # Parsed once here rather than on every /marathon status
+        self._started_at = value
+        try:
+            started = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            self._started_dt: Optional[datetime] = None
+            return
+        if started.tzinfo is None:
+            started = started.replace(tzinfo=timezone.utc)
+        self._started_dt = started
 
     # ── Persistence ─────────────────────────────────────
 
     def _save(self):
-        """Save marathon state to JSON."""
+        """Save balances and start time (the trades live in the ledger)."""
         data = {
             "starting_balance": self.starting_balance,
             "current_balance": self.current_balance,
             "started_at": self.started_at,
-            "trades": [asdict(t) for t in self.trades],
         }
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        if digest == self._saved_digest:
+            return
         try:
-            MARATHON_FILE.write_text(json.dumps(data, indent=2, ensure_ascii=False))
+            # Write a temp file and rename it over the old one — a crash mid-write
+            # leaves the previous state intact instead of a truncated file
+            tmp = META_FILE.with_suffix(".json.tmp")
+            tmp.write_bytes(payload)
+            os.replace(tmp, META_FILE)
+            self._saved_digest = digest
         except Exception as e:
             logger.error(f"Failed to save marathon data: {e}")
 
+    def _append_trade(self, trade: Trade):
+        """Append one trade to the JSONL ledger."""
+        try:
+            with LEDGER_FILE.open("ab") as f:
+                f.write(orjson.dumps(trade) + b"\n")
+        except Exception as e:
+            logger.error(f"Failed to append marathon trade: {e}")
+
+    @staticmethod
+    def _write_ledger(trades: list[Trade]):
+        """Rewrite the whole ledger (migration, repair and reset only)."""
+        tmp = LEDGER_FILE.with_suffix(".jsonl.tmp")
+        tmp.write_bytes(b"".join(orjson.dumps(t) + b"\n" for t in trades))
+        os.replace(tmp, LEDGER_FILE)
+
     def _load(self):
-        """Load marathon state from JSON if exists."""
-        if not MARATHON_FILE.exists():
+        """Load marathon state from disk if it exists."""
+        if not META_FILE.exists():
+            if LEGACY_FILE.exists():
+                self._migrate_legacy()
+                return
             logger.info(f"🏁 New marathon started! Balance: ${self.starting_balance}")
             self._save()
             return
 
         try:
-            data = json.loads(MARATHON_FILE.read_text())
+            raw = META_FILE.read_bytes()
+            data = orjson.loads(raw)
+            self._saved_digest = hashlib.blake2b(raw, digest_size=16).digest()
             self.starting_balance = data["starting_balance"]
             self.current_balance = data["current_balance"]
             self.started_at = data["started_at"]
-            self.trades = [Trade(**t) for t in data.get("trades", [])]
+            self.trades = self._read_ledger()
             logger.info(
                 f"📂 Marathon loaded: ${self.current_balance:.2f} "
                 f"({len(self.trades)} trades)"
@@ -82,6 +147,50 @@ class MarathonTracker:
         except Exception as e:
             logger.error(f"Failed to load marathon data: {e}")
 
+    @classmethod
+    def _read_ledger(cls) -> list[Trade]:
+        """
+        Stream trades from the JSONL ledger. Unreadable lines (e.g. one torn by
+        a crash mid-append) are skipped and the ledger is rewritten without
+        them, so the next append starts on a clean line.
+        """
+        trades = []
+        if not LEDGER_FILE.exists():
+            return trades
+        bad = 0
+        with LEDGER_FILE.open("rb") as f:
+            for line in f:
+                try:
+                    trades.append(Trade(**orjson.loads(line)))
+                except (orjson.JSONDecodeError, TypeError) as e:
+                    bad += 1
+                    logger.warning(f"Skipping bad marathon ledger line: {e}")
+        if bad:
+            cls._write_ledger(trades)
+        return trades
+
+    def _migrate_legacy(self):
+        """Convert the old single-file marathon_data.json into meta + ledger, once."""
+        try:
+            raw = LEGACY_FILE.read_bytes()
+            try:
+                data = orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # Older files written by json.dumps may hold NaN / Infinity
+                data = json.loads(raw)
+            self.starting_balance = data["starting_balance"]
+            self.current_balance = data["current_balance"]
+            self.started_at = data["started_at"]
+            self.trades = [Trade(**t) for t in data.get("trades", [])]
+            self._write_ledger(self.trades)
+            self._save()
+            logger.info(
+                f"📂 Marathon migrated from {LEGACY_FILE.name}: "
+                f"${self.current_balance:.2f} ({len(self.trades)} trades)"
+            )
+        except Exception as e:
+            logger.error(f"Failed to migrate marathon data: {e}")
+
     # ── Trade Recording ─────────────────────────────────
 
     def record_trade(
@@ -96,8 +205,10 @@ class MarathonTracker:
         exit_reason: str,
     ) -> Trade:
         """
-        Record a closed trade and update the balance.
+        Record a closed trade and update the balance in memory.
         PnL is applied to the allocated portion of balance.
+        Persist it with save_trade() — it does blocking file I/O, so async
+        callers run it in a worker thread.
         """
         balance_before = self.current_balance
 
@@ -123,7 +234,7 @@ class MarathonTracker:
         )
 
         self.trades.append(trade)
-        self._save()
+        self._update_stats(trade)
 
         logger.info(
             f"💰 Marathon trade: {symbol} {direction} | "
@@ -133,6 +244,11 @@ class MarathonTracker:
 
         return trade
 
+    def save_trade(self, trade: Trade):
+        """Append a recorded trade to the ledger and save the new balance."""
+        self._append_trade(trade)
+        self._save()
+
     # ── Stats ───────────────────────────────────────────
 
     @property
@@ -145,32 +261,59 @@ class MarathonTracker:
             return 0
         return (self.current_balance - self.starting_balance) / self.starting_balance * 100
 
+    # Running aggregates, kept in step with self.trades so the Telegram
+    # messages don't rescan the whole history on every call
+
+    def _rebuild_stats(self):
+        """Recompute the aggregates from self.trades (after load / reset)."""
+        self._win_count = 0
+        self._loss_count = 0
+        self._best_trade: Optional[Trade] = None
+        self._worst_trade: Optional[Trade] = None
+        self._max_balance: Optional[float] = None
+        for trade in self.trades:
+            self._update_stats(trade)
+
+    def _update_stats(self, trade: Trade):
+        """Fold one newly recorded trade into the aggregates."""
+        if trade.pnl_usd > 0:
+            self._win_count += 1
+        else:
+            self._loss_count += 1
+        # Strict comparisons: on ties the earliest trade stays, like max()/min()
+        if self._best_trade is None or trade.pnl_usd > self._best_trade.pnl_usd:
+            self._best_trade = trade
+        if self._worst_trade is None or trade.pnl_usd < self._worst_trade.pnl_usd:
+            self._worst_trade = trade
+        if self._max_balance is None or trade.balance_after > self._max_balance:
+            self._max_balance = trade.balance_after
+
     @property
     def win_count(self) -> int:
-        return sum(1 for t in self.trades if t.pnl_usd > 0)
+        return self._win_count
 
     @property
     def loss_count(self) -> int:
-        return sum(1 for t in self.trades if t.pnl_usd <= 0)
+        return self._loss_count
 
     @property
     def winrate(self) -> float:
         total = len(self.trades)
-        return (self.win_count / total * 100) if total > 0 else 0
+        return (self._win_count / total * 100) if total > 0 else 0
 
     @property
     def best_trade(self) -> Optional[Trade]:
-        return max(self.trades, key=lambda t: t.pnl_usd) if self.trades else None
+        return self._best_trade
 
     @property
     def worst_trade(self) -> Optional[Trade]:
-        return min(self.trades, key=lambda t: t.pnl_usd) if self.trades else None
+        return self._worst_trade
 
     @property
     def max_balance(self) -> float:
-        if not self.trades:
+        if self._max_balance is None:
             return self.starting_balance
-        return max(t.balance_after for t in self.trades)
+        return self._max_balance
 
     @property
     def drawdown_pct(self) -> float:
@@ -183,10 +326,15 @@ class MarathonTracker:
     def _progress_bar(self, current: float, target: float, length: int = 15) -> str:
         """Visual progress bar."""
         if target <= 0:
-            return "░" * length
-        pct = min(current / target, 1.0)
-        filled = int(length * pct)
-        return "█" * filled + "░" * (length - filled)
+            return _BAR_EMPTY[:length]
+        filled = max(int(length * min(current / target, 1.0)), 0)
+        return _BAR_FULL[:filled] + _BAR_EMPTY[:length - filled]
+
+    @staticmethod
+    def _next_milestone(balance: float) -> int:
+        """First milestone above balance (the last one once all are passed)."""
+        idx = bisect.bisect_right(MILESTONES, balance)
+        return MILESTONES[idx] if idx < len(MILESTONES) else MILESTONES[-1]
 
     # ── Telegram Messages ───────────────────────────────
 
@@ -196,8 +344,7 @@ class MarathonTracker:
         growth = self.total_pnl_pct
 
         # Milestones
-        milestones = [100, 250, 500, 1000, 2500, 5000, 10000]
-        next_target = next((m for m in milestones if m > self.current_balance), milestones[-1])
+        next_target = self._next_milestone(self.current_balance)
         progress = self._progress_bar(self.current_balance, next_target)
 
         msg = (
@@ -220,22 +367,18 @@ class MarathonTracker:
     def format_status(self) -> str:
         """Full marathon status for /marathon command."""
         days = 0
-        try:
-            started = datetime.fromisoformat(self.started_at)
-            days = (datetime.now(timezone.utc) - started).days
-        except Exception:
-            pass
+        if self._started_dt is not None:
+            days = (datetime.now(timezone.utc) - self._started_dt).days
 
         growth = self.total_pnl_pct
         growth_emoji = "📈" if growth >= 0 else "📉"
 
         # Milestones check
-        milestones = [100, 250, 500, 1000, 2500, 5000, 10000]
-        next_target = next((m for m in milestones if m > self.current_balance), milestones[-1])
+        next_target = self._next_milestone(self.current_balance)
         progress = self._progress_bar(self.current_balance, next_target)
 
         # Milestone achievements
-        achieved = [m for m in milestones if self.max_balance >= m]
+        achieved = MILESTONES[:bisect.bisect_right(MILESTONES, self.max_balance)]
         achieved_text = ", ".join(f"${m}" for m in achieved) if achieved else "—"
 
         msg = (
@@ -285,5 +428,10 @@ class MarathonTracker:
         self.current_balance = new_balance
         self.trades = []
         self.started_at = datetime.now(timezone.utc).isoformat()
+        self._rebuild_stats()
+        try:
+            self._write_ledger(self.trades)
+        except Exception as e:
+            logger.error(f"Failed to clear marathon ledger: {e}")
         self._save()
         logger.info(f"🏁 Marathon RESET! New balance: ${new_balance}")
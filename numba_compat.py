@@ -0,0 +1,32 @@
+"""
+numba_compat — optional Numba JIT for the numeric kernels.
+With numba installed, `njit` compiles to machine code; without it the
+decorated functions run as plain Python (same results, just slower).
+Kernels prebuilt by build_kernels.py are preferred over both.
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit — supports bare and parametrised use."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+def load_aot(*names: str):
+    """
+    The fast_ta_aot extension built by build_kernels.py, or None (use njit).
+    A stale build that lacks any of `names` is ignored as well.
+    """
+    try:
+        import fast_ta_aot
+    except ImportError:
+        return None
+    if not all(hasattr(fast_ta_aot, name) for name in names):
+        return None
+    return fast_ta_aot
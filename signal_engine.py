@@ -3,16 +3,18 @@ Signal Engine — core logic for multi-timeframe analysis and signal scoring.
 v3: Added BTC market filter, position sizing, dual TP levels, enhanced volume.
 """
 
+import asyncio
+import bisect
 import logging
 from dataclasses import dataclass, field
 from typing import Optional
 from datetime import datetime, timezone
 
 import config
-from data_fetcher import DataFetcher
+from data_fetcher import OHLCV, DataFetcher
 from indicators import (
     Direction, IndicatorResult,
-    ALL_INDICATORS, TREND_INDICATORS,
+    ALL_INDICATORS, TREND_INDICATORS, run_all,
     calculate_atr,
     calculate_funding_rate,
     calculate_open_interest,
@@ -21,6 +23,23 @@ from indicators import (
 
 logger = logging.getLogger(__name__)
 
+# Score points an agreeing extra indicator adds at full confidence
+_FUNDING_BONUS = 8
+_OI_BONUS = 10
+_SR_BONUS = 12
+# Score multipliers for a partly aligned / opposing confirmation timeframe
+_PARTIAL_CONFIRM_FACTOR = 1.1
+_AGAINST_CONFIRM_FACTOR = 0.7
+# Volume ratio buckets (bisect_right, so each level is inclusive):
+# 0 = dust, 1 = normal, 2 = above average, 3 = spike → (label, score bonus)
+_VOLUME_LEVELS = (config.VOLUME_MIN_RATIO, config.VOLUME_MULTIPLIER, config.VOLUME_SPIKE_MULTIPLIER)
+_VOLUME_LADDER = (
+    ("❌ Низький об'єм ({ratio:.1f}x avg) — DUST", -10),
+    ("⚪ Нормальний ({ratio:.1f}x avg)", 0),
+    ("✅ Вище середнього ({ratio:.1f}x avg)", 5),
+    ("🔥 Spike ({ratio:.1f}x avg)", 8),
+)
+
 
 @dataclass
 class Signal:
@@ -54,7 +73,7 @@ class SignalEngine:
         self.fetcher = data_fetcher or DataFetcher()
         self._btc_change_1h: Optional[float] = None  # cached BTC 1h change
 
-    def _check_btc_filter(self) -> tuple[bool, str]:
+    async def _check_btc_filter(self) -> tuple[bool, str]:
         """
         Check BTC market condition.
         Returns (longs_allowed, shorts_allowed, info_string).
@@ -62,13 +81,13 @@ class SignalEngine:
         if not config.BTC_FILTER_ENABLED:
             return True, "BTC filter disabled"
 
-        df_btc = self.fetcher.fetch_ohlcv(config.BTC_FILTER_SYMBOL, "1h")
-        if df_btc is None or len(df_btc) < 2:
+        btc_data = await self.fetcher.fetch_ohlcv(config.BTC_FILTER_SYMBOL, "1h")
+        if btc_data is None or len(btc_data) < 2:
             return True, "⚠️ BTC data unavailable"
 
         # Calculate BTC change over last 1h candle
-        price_now = float(df_btc["close"].iloc[-1])
-        price_1h_ago = float(df_btc["close"].iloc[-2])
+        price_now = float(btc_data.close[-1])
+        price_1h_ago = float(btc_data.close[-2])
         btc_change = (price_now - price_1h_ago) / price_1h_ago * 100
         self._btc_change_1h = btc_change
 
@@ -90,51 +109,45 @@ class SignalEngine:
         else:
             return config.POSITION_SIZE_MODERATE
 
-    def _check_volume_quality(self, df) -> tuple[str, float]:
+    def _check_volume_quality(self, data: Optional[OHLCV]) -> tuple[str, float]:
         """
         Enhanced volume verification.
         Returns (quality_label, volume_bonus).
         """
-        if df is None or len(df) < 20:
+        if data is None or len(data) < 20:
             return "⚠️ Insufficient data", 0
 
-        current_vol = float(df["volume"].iloc[-1])
-        avg_vol = float(df["volume"].iloc[-20:].mean())
+        current_vol = float(data.volume[-1])
+        avg_vol = float(data.volume[-20:].mean())
 
         if avg_vol == 0:
             return "⚠️ Zero volume", 0
 
         ratio = current_vol / avg_vol
 
-        if ratio < config.VOLUME_MIN_RATIO:
-            return f"❌ Низький об'єм ({ratio:.1f}x avg) — DUST", -10
-        elif ratio >= config.VOLUME_SPIKE_MULTIPLIER:
-            return f"🔥 Spike ({ratio:.1f}x avg)", 8
-        elif ratio >= config.VOLUME_MULTIPLIER:
-            return f"✅ Вище середнього ({ratio:.1f}x avg)", 5
-        elif ratio >= config.VOLUME_MIN_RATIO:
-            return f"⚪ Нормальний ({ratio:.1f}x avg)", 0
-        else:
+        if ratio != ratio:
             return f"⚠️ Слабкий ({ratio:.1f}x avg)", -5
+        template, bonus = _VOLUME_LADDER[bisect.bisect_right(_VOLUME_LEVELS, ratio)]
+        return template.format(ratio=ratio), bonus
 
-    def analyze_pair(self, symbol: str, btc_info: str = "") -> Optional[Signal]:
+    async def analyze_pair(self, symbol: str, btc_info: str = "") -> Optional[Signal]:
         """
         Analyze a single pair across primary and confirmation timeframes.
         Returns a Signal if score >= threshold, else None.
         """
         # ── Fetch data ──────────────────────────────────────
-        df_primary = self.fetcher.fetch_ohlcv(symbol, config.PRIMARY_TIMEFRAME)
-        df_confirm = self.fetcher.fetch_ohlcv(symbol, config.CONFIRMATION_TIMEFRAME)
+        primary = await self.fetcher.fetch_ohlcv(symbol, config.PRIMARY_TIMEFRAME)
+        confirm = await self.fetcher.fetch_ohlcv(symbol, config.CONFIRMATION_TIMEFRAME)
 
-        if df_primary is None or len(df_primary) < 50:
+        if primary is None or len(primary) < 50:
             logger.warning(f"{symbol}: insufficient primary data")
             return None
+        close = primary.close
+        current_price = float(close[-1])
 
         # ── Run all standard indicators on primary TF ──────
-        primary_results: list[IndicatorResult] = []
-        for indicator_fn in ALL_INDICATORS:
-            result = indicator_fn(df_primary)
-            primary_results.append(result)
+        # Off the event loop: the exit checks and Telegram polling keep running
+        primary_results: list[IndicatorResult] = await asyncio.to_thread(run_all, primary)
 
         # ── Count votes ────────────────────────────────────
         long_votes = [r for r in primary_results if r.direction == Direction.LONG]
@@ -162,7 +175,7 @@ class SignalEngine:
                 return None
 
         # ── Enhanced Volume Check ─────────────────────────
-        volume_quality, volume_bonus = self._check_volume_quality(df_primary)
+        volume_quality, volume_bonus = self._check_volume_quality(primary)
 
         # ── Calculate base score ───────────────────────────
         total_indicators = len(ALL_INDICATORS)
@@ -173,12 +186,21 @@ class SignalEngine:
         # Apply volume bonus/penalty
         base_score += volume_bonus
 
+        # Skip the confirmation TF and the extra fetches when even the best
+        # multiplier plus every extra bonus can't reach the threshold
+        factors = (config.CONFIRMATION_MULTIPLIER, _PARTIAL_CONFIRM_FACTOR, _AGAINST_CONFIRM_FACTOR, 1.0)
+        best_case = max(base_score * f for f in factors)
+        best_case += _FUNDING_BONUS + _OI_BONUS + _SR_BONUS
+        if best_case < config.SIGNAL_THRESHOLD:
+            logger.debug(f"{symbol}: best-case score {best_case:.0f} below threshold {config.SIGNAL_THRESHOLD}")
+            return None
+
         # ── Higher timeframe confirmation ──────────────────
         confirmation_aligned = False
         confirmation_details = "No confirmation data"
 
-        if df_confirm is not None and len(df_confirm) >= 50:
-            confirm_results = [indicator_fn(df_confirm) for indicator_fn in TREND_INDICATORS]
+        if confirm is not None and len(confirm) >= 50:
+            confirm_results = await asyncio.to_thread(run_all, confirm, TREND_INDICATORS)
             confirm_same = [r for r in confirm_results if r.direction == direction]
 
             if len(confirm_same) >= 2:
@@ -187,50 +209,49 @@ class SignalEngine:
                 base_score *= config.CONFIRMATION_MULTIPLIER
             elif len(confirm_same) == 1:
                 confirmation_details = f"{config.CONFIRMATION_TIMEFRAME} trend partially aligned ({len(confirm_same)}/{len(TREND_INDICATORS)})"
-                base_score *= 1.1
+                base_score *= _PARTIAL_CONFIRM_FACTOR
             else:
                 confirmation_details = f"{config.CONFIRMATION_TIMEFRAME} trend AGAINST signal"
-                base_score *= 0.7
+                base_score *= _AGAINST_CONFIRM_FACTOR
 
         # ── Extra indicators: Funding, OI, S/R ────────────
         extra_indicators: list[IndicatorResult] = []
-        atr = calculate_atr(df_primary)
+        atr = calculate_atr(primary)
         if atr is None or atr == 0:
-            atr = df_primary["close"].iloc[-1] * 0.01
+            atr = current_price * 0.01
 
         # Funding Rate
-        funding_data = self.fetcher.fetch_funding_rate(symbol)
+        funding_data = await self.fetcher.fetch_funding_rate(symbol)
         funding_result = calculate_funding_rate(funding_data)
         extra_indicators.append(funding_result)
 
         if funding_result.direction == direction:
-            base_score += funding_result.confidence * 8
+            base_score += funding_result.confidence * _FUNDING_BONUS
         elif funding_result.direction != Direction.NEUTRAL:
             base_score -= funding_result.confidence * 5
 
         # Open Interest
-        oi_data = self.fetcher.fetch_open_interest(symbol)
+        oi_data = await self.fetcher.fetch_open_interest(symbol)
         price_change_pct = 0
-        if len(df_primary) >= 10:
-            old_price = df_primary["close"].iloc[-10]
-            new_price = df_primary["close"].iloc[-1]
-            price_change_pct = (new_price - old_price) / old_price * 100
+        if len(primary) >= 10:
+            old_price = float(close[-10])
+            price_change_pct = (current_price - old_price) / old_price * 100
 
         oi_result = calculate_open_interest(oi_data, price_change_pct)
         extra_indicators.append(oi_result)
 
         if oi_result.direction == direction:
-            base_score += oi_result.confidence * 10
+            base_score += oi_result.confidence * _OI_BONUS
         elif oi_result.direction != Direction.NEUTRAL:
             base_score -= oi_result.confidence * 5
 
         # Support/Resistance
-        sr_data = self.fetcher.find_support_resistance(df_primary)
+        sr_data = await asyncio.to_thread(self.fetcher.find_support_resistance, primary)
         sr_result = analyze_support_resistance(sr_data, direction, atr)
         extra_indicators.append(sr_result)
 
         if sr_result.direction == direction:
-            base_score += sr_result.confidence * 12
+            base_score += sr_result.confidence * _SR_BONUS
         elif sr_result.direction != Direction.NEUTRAL:
             base_score -= sr_result.confidence * 15
 
@@ -246,8 +267,6 @@ class SignalEngine:
         position_size_pct = self._get_position_size(final_score)
 
         # ── Calculate entry/SL/TP1/TP2 ─────────────────────
-        current_price = float(df_primary["close"].iloc[-1])
-
         if direction == Direction.LONG:
             entry_low = current_price - atr * 0.3
             entry_high = current_price + atr * 0.1
@@ -294,36 +313,48 @@ class SignalEngine:
             volume_quality=volume_quality,
         )
 
-    def scan_all(self, pairs: Optional[list[str]] = None) -> list[Signal]:
+    async def scan_symbol(self, symbol: str, btc_info: str = "") -> Optional[Signal]:
+        """
+        analyze_pair() for one symbol with scan logging.
+        Errors are logged and yield None so one bad pair can't sink the scan.
+        """
+        try:
+            signal = await self.analyze_pair(symbol, btc_info)
+        except Exception as e:
+            logger.error(f"Error analyzing {symbol}: {e}")
+            return None
+
+        if signal:
+            logger.info(
+                f"✅ SIGNAL: {symbol} {signal.direction.value} "
+                f"Score={signal.score} {signal.strength} "
+                f"Size={signal.position_size_pct}%"
+            )
+        else:
+            logger.debug(f"⏭  {symbol}: no signal")
+        return signal
+
+    async def scan_all(self, pairs: Optional[list[str]] = None) -> list[Signal]:
         """
         Scan all configured pairs and return list of qualifying signals.
         """
         pairs = pairs or config.TRADING_PAIRS
         self.fetcher.clear_cache()
-        signals = []
 
-        # Check BTC filter first (once per cycle)
-        _, btc_info = self._check_btc_filter()
+        # Fetch every pair concurrently up front — analysis below reads the cache.
+        # The BTC filter (once per cycle) pulls its candles alongside them.
+        _, (_, btc_info) = await asyncio.gather(
+            self.fetcher.fetch_all(
+                pairs, [config.PRIMARY_TIMEFRAME, config.CONFIRMATION_TIMEFRAME]
+            ),
+            self._check_btc_filter(),
+        )
         logger.info(f"🪙 {btc_info}")
 
-        for symbol in pairs:
-            try:
-                signal = self.analyze_pair(symbol, btc_info)
-                if signal:
-                    signals.append(signal)
-                    logger.info(
-                        f"✅ SIGNAL: {symbol} {signal.direction.value} "
-                        f"Score={signal.score} {signal.strength} "
-                        f"Size={signal.position_size_pct}%"
-                    )
-                else:
-                    logger.debug(f"⏭  {symbol}: no signal")
-            except Exception as e:
-                logger.error(f"Error analyzing {symbol}: {e}")
-
-            # Small delay to avoid Bybit rate limits
-            import time
-            time.sleep(0.5)
+        # One coroutine per pair: fetches missed above overlap instead of running
+        # back to back, and the fetcher's rate limiter still paces the requests
+        results = await asyncio.gather(*(self.scan_symbol(s, btc_info) for s in pairs))
+        signals = [s for s in results if s]
 
         signals.sort(key=lambda s: s.score, reverse=True)
         return signals
@@ -3,13 +3,19 @@ Telegram bot — formats signals and sends them to the configured chat.
 v3: Added exit alerts, position tracking, BTC filter info, position sizing.
 """
 
+import asyncio
+import functools
+import heapq
 import logging
+import re
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Optional
 
-from telegram import Update, Bot
+from telegram import Update
 from telegram.constants import ParseMode
 from telegram.ext import (
+    AIORateLimiter,
     Application,
     CommandHandler,
     ContextTypes,
@@ -24,6 +30,18 @@ from trader import BybitTrader
 
 logger = logging.getLogger(__name__)
 
+_SEPARATOR = "━" * 30
+_DIRECTION_EMOJI = {Direction.LONG: "🟢", Direction.SHORT: "🔴"}
+
+# Legacy Markdown only treats _ * ` [ as markup; escaping them in free text
+# (outside any entity) keeps a stray character from failing the whole message
+_MD_SPECIAL = re.compile(r"([_*`\[])")
+
+
+def _md_escape(text: str) -> str:
+    """Escape legacy-Markdown control characters in plain text."""
+    return _MD_SPECIAL.sub(r"\\\1", text)
+
 
 class TelegramSignalBot:
     """Sends trading signals via Telegram and handles basic commands."""
@@ -35,43 +53,65 @@ class TelegramSignalBot:
         marathon: Optional[MarathonTracker] = None,
         trader: Optional[BybitTrader] = None,
     ):
-        self.bot = Bot(token=config.TELEGRAM_BOT_TOKEN)
+        # One Application for sending and polling: every message reuses its
+        # keep-alive connection pool; getUpdates gets a pool of its own.
+        # The rate limiter paces every call through the bot to Telegram's
+        # flood limits, so bursts wait up front instead of hitting RetryAfter.
+        self._app: Application = (
+            Application.builder()
+            .token(config.TELEGRAM_BOT_TOKEN)
+            .connection_pool_size(config.TELEGRAM_POOL_SIZE)
+            .pool_timeout(config.TELEGRAM_POOL_TIMEOUT)
+            .get_updates_connection_pool_size(config.TELEGRAM_UPDATES_POOL_SIZE)
+            .rate_limiter(AIORateLimiter(
+                overall_max_rate=config.TELEGRAM_MAX_RATE,
+                overall_time_period=1,
+                group_max_rate=config.TELEGRAM_GROUP_MAX_RATE,
+                group_time_period=60,
+                max_retries=config.TELEGRAM_MAX_RETRIES,
+            ))
+            .build()
+        )
+        self.bot = self._app.bot
         self.engine = signal_engine
         self.tracker = exit_tracker or ExitTracker()
         self.marathon = marathon
         self.trader = trader
         self._last_sent: dict[str, datetime] = {}
-        self._app: Optional[Application] = None
+        # (cooldown expiry, symbol) min-heap; stale entries are skipped on pop
+        self._cooldown_heap: list[tuple[datetime, str]] = []
+        # Exit alerts and status messages queued for the next coalesced send
+        self._outbox: list[str] = []
+        self._flush_task: Optional[asyncio.Task] = None
 
     def format_signal(self, signal: Signal) -> str:
         """Format a Signal into a Telegram message with markdown."""
         direction_emoji = "🟢 LONG" if signal.direction == Direction.LONG else "🔴 SHORT"
 
         # Indicator list
-        indicators_text = ""
-        for ind in signal.primary_indicators:
-            indicators_text += f"  • {ind.name}: {ind.description}\n"
+        indicators_text = "".join(
+            f"  • {_md_escape(ind.name)}: {_md_escape(ind.description)}\n"
+            for ind in signal.primary_indicators
+        )
 
         # Extra indicators (Funding, OI, S/R)
-        extra_text = ""
-        for ind in signal.extra_indicators:
-            if ind.direction != Direction.NEUTRAL or ind.confidence > 0:
-                emoji = "🟢" if ind.direction == Direction.LONG else "🔴" if ind.direction == Direction.SHORT else "⚪"
-                extra_text += f"  {emoji} {ind.description}\n"
-            else:
-                extra_text += f"  ⚪ {ind.description}\n"
+        extra_text = "".join(
+            f"  {_DIRECTION_EMOJI.get(ind.direction, '⚪')} {_md_escape(ind.description)}\n"
+            for ind in signal.extra_indicators
+        )
 
         # S/R levels
-        sr_text = ""
+        sr_lines = []
         if signal.sr_levels:
             supports = signal.sr_levels.get("support", [])
             resistances = signal.sr_levels.get("resistance", [])
             if supports:
                 nearest_sup = max(supports, key=lambda x: x[0])
-                sr_text += f"  🟢 Support: `{nearest_sup[0]:,.2f}` ({nearest_sup[1]}x)\n"
+                sr_lines.append(f"  🟢 Support: `{nearest_sup[0]:,.2f}` ({nearest_sup[1]}x)\n")
             if resistances:
                 nearest_res = min(resistances, key=lambda x: x[0])
-                sr_text += f"  🔴 Resistance: `{nearest_res[0]:,.2f}` ({nearest_res[1]}x)\n"
+                sr_lines.append(f"  🔴 Resistance: `{nearest_res[0]:,.2f}` ({nearest_res[1]}x)\n")
+        sr_text = "".join(sr_lines)
 
         # Confirmation
         confirm_emoji = "✅" if signal.confirmation_tf_aligned else "⚠️"
@@ -84,21 +124,27 @@ class TelegramSignalBot:
             fmt = ",.4f"
         else:
             fmt = ",.6f"
+        price_s, entry_lo_s, entry_hi_s, sl_s, tp1_s, tp2_s = (
+            format(v, fmt) for v in (
+                price, signal.entry_zone[0], signal.entry_zone[1],
+                signal.stop_loss, signal.take_profit_1, signal.take_profit_2,
+            )
+        )
 
-        msg = (
-            f"{'━' * 30}\n"
+        parts = [(
+            f"{_SEPARATOR}\n"
             f"📊 *{signal.symbol}* — {direction_emoji}\n"
-            f"{'━' * 30}\n"
+            f"{_SEPARATOR}\n"
             f"\n"
             f"💯 *Score:* {signal.score}/100 {signal.strength}\n"
-            f"💰 *Price:* `{signal.current_price:{fmt}}`\n"
+            f"💰 *Price:* `{price_s}`\n"
             f"💼 *Розмір позиції:* {signal.position_size_pct}% депозиту\n"
             f"\n"
             f"📍 *Entry Zone:*\n"
-            f"   `{signal.entry_zone[0]:{fmt}}` — `{signal.entry_zone[1]:{fmt}}`\n"
-            f"🛑 *Stop Loss:* `{signal.stop_loss:{fmt}}`\n"
-            f"🎯 *TP1 ({config.TP_PARTIAL_PCT}%):* `{signal.take_profit_1:{fmt}}`\n"
-            f"🎯🎯 *TP2 (100%):* `{signal.take_profit_2:{fmt}}`\n"
+            f"   `{entry_lo_s}` — `{entry_hi_s}`\n"
+            f"🛑 *Stop Loss:* `{sl_s}`\n"
+            f"🎯 *TP1 ({config.TP_PARTIAL_PCT}%):* `{tp1_s}`\n"
+            f"🎯🎯 *TP2 (100%):* `{tp2_s}`\n"
             f"📐 *Risk/Reward:* 1:{signal.risk_reward}\n"
             f"⏰ *Авто-вихід:* через {signal.exit_time_hours}h\n"
             f"\n"
@@ -106,36 +152,46 @@ class TelegramSignalBot:
             f"{indicators_text}\n"
             f"🔬 *Доп. аналіз:*\n"
             f"{extra_text}"
-            f"📊 *Об'єм:* {signal.volume_quality}\n"
-        )
+            f"📊 *Об'єм:* {_md_escape(signal.volume_quality)}\n"
+        )]
 
         if sr_text:
-            msg += f"\n🏗 *Рівні S/R:*\n{sr_text}"
+            parts.append(f"\n🏗 *Рівні S/R:*\n{sr_text}")
 
         if signal.btc_filter_info:
-            msg += f"\n🪙 *{signal.btc_filter_info}*\n"
+            parts.append(f"\n🪙 *{signal.btc_filter_info}*\n")
 
-        msg += (
+        parts.append(
             f"\n{confirm_emoji} *{config.CONFIRMATION_TIMEFRAME} Confirmation:*\n"
-            f"   {signal.confirmation_details}\n"
+            f"   {_md_escape(signal.confirmation_details)}\n"
             f"\n"
             f"🕐 {signal.timestamp.strftime('%Y-%m-%d %H:%M UTC')}\n"
-            f"{'━' * 30}\n"
+            f"{_SEPARATOR}\n"
             f"⚠️ _DYOR — це не фінансова порада!_"
         )
-        return msg
+        return "".join(parts)
 
-    async def send_signal(self, signal: Signal) -> bool:
-        """Send a signal to the configured chat, respecting cooldown."""
-        if signal.symbol in self._last_sent:
-            elapsed = datetime.now(timezone.utc) - self._last_sent[signal.symbol]
+    def _cooldown_ok(self, symbol: str, now: datetime) -> bool:
+        """True unless a signal for this symbol went out within the cooldown."""
+        if symbol in self._last_sent:
+            elapsed = now - self._last_sent[symbol]
             if elapsed < timedelta(minutes=config.SIGNAL_COOLDOWN_MINUTES):
                 logger.info(
-                    f"Skipping {signal.symbol} — cooldown "
+                    f"Skipping {symbol} — cooldown "
                     f"({elapsed.seconds // 60}m / {config.SIGNAL_COOLDOWN_MINUTES}m)"
                 )
                 return False
+        return True
+
+    async def send_signal(self, signal: Signal, now: Optional[datetime] = None) -> bool:
+        """Send a signal to the configured chat, respecting cooldown."""
+        now = now or datetime.now(timezone.utc)
+        if not self._cooldown_ok(signal.symbol, now):
+            return False
+        return await self._deliver_signal(signal, now)
 
+    async def _deliver_signal(self, signal: Signal, now: datetime) -> bool:
+        """Format and send a signal that already passed the cooldown check."""
         try:
             message = self.format_signal(signal)
             await self.bot.send_message(
@@ -143,7 +199,11 @@ class TelegramSignalBot:
                 text=message,
                 parse_mode=ParseMode.MARKDOWN,
             )
-            self._last_sent[signal.symbol] = datetime.now(timezone.utc)
+            self._last_sent[signal.symbol] = now
+            heapq.heappush(
+                self._cooldown_heap,
+                (now + timedelta(minutes=config.SIGNAL_COOLDOWN_MINUTES), signal.symbol),
+            )
             logger.info(f"✅ Sent signal for {signal.symbol}")
             return True
         except Exception as e:
@@ -151,37 +211,74 @@ class TelegramSignalBot:
             return False
 
     async def send_exit_alert(self, alert: ExitAlert) -> bool:
-        """Send an exit alert to Telegram."""
-        try:
-            await self.bot.send_message(
-                chat_id=config.TELEGRAM_CHAT_ID,
-                text=alert.message,
-                parse_mode=ParseMode.MARKDOWN,
-            )
-            logger.info(f"📤 Sent exit alert for {alert.position.symbol}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to send exit alert: {e}")
-            return False
-
-    async def send_signals(self, signals: list[Signal]) -> int:
-        """Send multiple signals. Returns count of sent messages."""
-        sent = 0
-        for signal in signals:
-            if await self.send_signal(signal):
-                sent += 1
-        return sent
+        """Queue an exit alert for the next coalesced Telegram send."""
+        self._enqueue(alert.message)
+        logger.info(f"📤 Queued exit alert for {alert.position.symbol}")
+        return True
+
+    async def send_signals(self, signals: list[Signal], now: Optional[datetime] = None) -> int:
+        """
+        Send multiple signals concurrently. Returns count of sent messages.
+        The shared pool and the rate limiter bound how many go out at once;
+        the whole batch shares one timestamp for cooldown checks and stamps.
+        """
+        now = now or datetime.now(timezone.utc)
+        self._expire_cooldowns(now)
+        # Signals still cooling down never get a coroutine scheduled
+        eligible = [s for s in signals if self._cooldown_ok(s.symbol, now)]
+        results = await asyncio.gather(
+            *(self._deliver_signal(s, now) for s in eligible), return_exceptions=True
+        )
+        return sum(1 for r in results if r is True)
+
+    def _expire_cooldowns(self, now: datetime):
+        """Forget symbols whose cooldown has run out so _last_sent stays bounded."""
+        cooldown = timedelta(minutes=config.SIGNAL_COOLDOWN_MINUTES)
+        heap = self._cooldown_heap
+        while heap and heap[0][0] <= now:
+            expiry, symbol = heapq.heappop(heap)
+            # A later send re-pushed the symbol; only its newest entry evicts it
+            last = self._last_sent.get(symbol)
+            if last is not None and last + cooldown == expiry:
+                del self._last_sent[symbol]
 
     async def send_status_message(self, text: str):
-        """Send a plain status message."""
-        try:
-            await self.bot.send_message(
-                chat_id=config.TELEGRAM_CHAT_ID,
-                text=text,
-                parse_mode=ParseMode.MARKDOWN,
-            )
-        except Exception as e:
-            logger.error(f"Failed to send status message: {e}")
+        """Queue a plain status message for the next coalesced Telegram send."""
+        self._enqueue(text)
+
+    # ── Outbox ──────────────────────────────────────────
+
+    def _enqueue(self, text: str):
+        """Add a message to the outbox and arm the debounce flush if it isn't already."""
+        self._outbox.append(text)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_soon())
+
+    async def _flush_soon(self):
+        await asyncio.sleep(config.TELEGRAM_COALESCE_SECONDS)
+        # Messages queued while this batch is sending arm a fresh flush
+        self._flush_task = None
+        await self.flush_outbox()
+
+    async def flush_outbox(self):
+        """Send everything queued, packed into as few messages as the size limit allows."""
+        batch, self._outbox = self._outbox, []
+        chunks: list[str] = []
+        for text in batch:
+            if chunks and len(chunks[-1]) + 2 + len(text) <= config.TELEGRAM_MESSAGE_LIMIT:
+                chunks[-1] = f"{chunks[-1]}\n\n{text}"
+            else:
+                chunks.append(text)
+
+        for chunk in chunks:
+            try:
+                await self.bot.send_message(
+                    chat_id=config.TELEGRAM_CHAT_ID,
+                    text=chunk,
+                    parse_mode=ParseMode.MARKDOWN,
+                )
+            except Exception as e:
+                logger.error(f"Failed to send status message: {e}")
 
     # ── Command Handlers ────────────────────────────────
 
@@ -202,6 +299,7 @@ class TelegramSignalBot:
     async def _cmd_status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /status command."""
         now = datetime.now(timezone.utc)
+        self._expire_cooldowns(now)
         cooldowns = []
         for sym, last in self._last_sent.items():
             elapsed = (now - last).seconds // 60
@@ -230,7 +328,7 @@ class TelegramSignalBot:
         await update.message.reply_text("🔄 Сканую ринки...")
 
         if self.engine:
-            signals = self.engine.scan_all()
+            signals = await self.engine.scan_all()
             if signals:
                 await update.message.reply_text(
                     f"📡 Знайдено {len(signals)} сигнал(ів)! Надсилаю..."
@@ -273,7 +371,7 @@ class TelegramSignalBot:
     async def _cmd_balance(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /balance — show real Bybit balance."""
         if self.trader:
-            balance = self.trader.get_balance()
+            balance = await self.trader.get_balance()
             await update.message.reply_text(
                 f"💰 *Bybit Баланс:* `${balance:.2f}` USDT",
                 parse_mode=ParseMode.MARKDOWN,
@@ -288,25 +386,37 @@ class TelegramSignalBot:
     async def _cmd_real(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /real — show real Bybit open positions."""
         if self.trader:
-            text = self.trader.format_positions_text()
+            text = await self.trader.format_positions_text()
         else:
             text = "📡 Auto-trade вимкнено"
         await update.message.reply_text(text, parse_mode=ParseMode.MARKDOWN)
 
+    def _wrap(self, name: str, handler):
+        """Time a command handler and log any exception it raises."""
+        @functools.wraps(handler)
+        async def wrapped(update: Update, context: ContextTypes.DEFAULT_TYPE):
+            start = time.perf_counter()
+            try:
+                await handler(update, context)
+            except Exception as e:
+                logger.error(f"/{name} handler failed: {e}", exc_info=True)
+            finally:
+                logger.debug(f"⏱ /{name} took {(time.perf_counter() - start) * 1000:.1f}ms")
+        return wrapped
+
     def build_application(self) -> Application:
-        """Build and return a Telegram Application with command handlers."""
-        self._app = (
-            Application.builder()
-            .token(config.TELEGRAM_BOT_TOKEN)
-            .build()
-        )
-        self._app.add_handler(CommandHandler("start", self._cmd_start))
-        self._app.add_handler(CommandHandler("status", self._cmd_status))
-        self._app.add_handler(CommandHandler("scan", self._cmd_scan))
-        self._app.add_handler(CommandHandler("pairs", self._cmd_pairs))
-        self._app.add_handler(CommandHandler("positions", self._cmd_positions))
-        self._app.add_handler(CommandHandler("history", self._cmd_history))
-        self._app.add_handler(CommandHandler("marathon", self._cmd_marathon))
-        self._app.add_handler(CommandHandler("balance", self._cmd_balance))
-        self._app.add_handler(CommandHandler("real", self._cmd_real))
+        """Register the command handlers on the shared Application and return it."""
+        handlers = [
+            ("start", self._cmd_start),
+            ("status", self._cmd_status),
+            ("scan", self._cmd_scan),
+            ("pairs", self._cmd_pairs),
+            ("positions", self._cmd_positions),
+            ("history", self._cmd_history),
+            ("marathon", self._cmd_marathon),
+            ("balance", self._cmd_balance),
+            ("real", self._cmd_real),
+        ]
+        for name, handler in handlers:
+            self._app.add_handler(CommandHandler(name, self._wrap(name, handler)))
         return self._app
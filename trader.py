@@ -4,11 +4,13 @@ Opens market orders with SL/TP when a signal is generated.
 Tracks real positions and syncs with marathon tracker.
 """
 
+import asyncio
 import logging
 from typing import Optional
 from datetime import datetime, timezone
 
-import ccxt
+import ccxt.async_support as ccxt
+import ccxt.pro as ccxtpro
 
 import config
 from signal_engine import Signal
@@ -19,7 +21,7 @@ logger = logging.getLogger(__name__)
 
 class BybitTrader:
     """
-    Executes real trades on Bybit Futures via CCXT.
+    Executes real trades on Bybit Futures via async CCXT.
     - Opens LONG/SHORT market orders
     - Sets SL and TP orders
     - Fetches real balance and open positions
@@ -32,7 +34,9 @@ class BybitTrader:
                 "BYBIT_API_KEY and BYBIT_API_SECRET must be set in .env"
             )
 
-        self.exchange = ccxt.bybit({
+        # CCXT Pro's client speaks REST as well, so streaming needs no second session
+        exchange_class = ccxtpro.bybit if config.TRADER_USE_WEBSOCKET else ccxt.bybit
+        self.exchange = exchange_class({
             "apiKey": config.BYBIT_API_KEY,
             "secret": config.BYBIT_API_SECRET,
             "options": {
@@ -46,48 +50,155 @@ class BybitTrader:
             self.exchange.set_sandbox_mode(True)
             logger.info("🧪 Bybit TESTNET mode enabled")
 
-        self.exchange.load_markets()
+        # symbol → (min_cost, amount_precision, price_precision); markets don't
+        # change for the session, so open_position never walks the market dict
+        self._market_cache: dict[str, tuple] = {}
+        # (symbol, leverage) pairs already applied this session
+        self._leverage_set: set[tuple[str, int]] = set()
+        # Wallet / position mirrors fed by the private streams; None = read via REST
+        self._balance: Optional[float] = None
+        self._positions: Optional[dict[str, dict]] = None
+        self._tasks: list[asyncio.Task] = []
         logger.info("💱 BybitTrader initialized")
 
+    @classmethod
+    async def create(cls) -> "BybitTrader":
+        """Build a trader and load exchange markets once up front."""
+        trader = cls()
+        try:
+            markets = await trader.exchange.load_markets()
+        except Exception:
+            await trader.close()
+            raise
+        trader._market_cache = {
+            symbol: cls._market_limits(market) for symbol, market in markets.items()
+        }
+        if config.TRADER_USE_WEBSOCKET:
+            trader.start_streams()
+        return trader
+
+    def start_streams(self):
+        """Mirror the wallet and open positions from Bybit's private websocket."""
+        self._tasks = [
+            asyncio.create_task(self._watch_balance()),
+            asyncio.create_task(self._watch_positions()),
+        ]
+        logger.info("📡 Streaming Bybit wallet and positions")
+
+    async def _watch_balance(self):
+        while True:
+            try:
+                if self._balance is None:
+                    self._balance = self._usdt_free(
+                        await self.exchange.fetch_balance({"type": "swap"})
+                    )
+                balance = await self.exchange.watch_balance({"type": "swap"})
+                # Wallet pushes only carry the coins that changed
+                if "USDT" in balance:
+                    self._balance = self._usdt_free(balance)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Wallet stream error: %s", e)
+                self._balance = None
+                await asyncio.sleep(5)
+
+    async def _watch_positions(self):
+        while True:
+            try:
+                if self._positions is None:
+                    self._positions = {
+                        p["symbol"]: p for p in await self._fetch_open_positions()
+                    }
+                for p in await self.exchange.watch_positions():
+                    info = self._position_info(p)
+                    if info["contracts"] > 0:
+                        self._positions[info["symbol"]] = info
+                    else:
+                        self._positions.pop(info["symbol"], None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Updates may have been missed — fall back to REST until reseeded
+                logger.warning("Position stream error: %s", e)
+                self._positions = None
+                await asyncio.sleep(5)
+
+    async def close(self):
+        """Stop the streams and close the underlying exchange session."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.exchange.close()
+
+    @staticmethod
+    def _market_limits(market: dict) -> tuple:
+        """(min_cost, amount_precision, price_precision) of a CCXT market."""
+        return (
+            market.get("limits", {}).get("cost", {}).get("min", 1),
+            market.get("precision", {}).get("amount", 8),
+            market.get("precision", {}).get("price"),
+        )
+
+    def _get_market_limits(self, symbol: str) -> tuple:
+        """Cached market limits; symbols outside load_markets() are looked up once."""
+        try:
+            return self._market_cache[symbol]
+        except KeyError:
+            limits = self._market_limits(self.exchange.market(symbol))
+            self._market_cache[symbol] = limits
+            return limits
+
     # ── Balance ─────────────────────────────────────────
 
-    def get_balance(self) -> float:
+    @staticmethod
+    def _usdt_free(balance: dict) -> float:
+        return float(balance.get("USDT", {}).get("free", 0) or 0)
+
+    async def get_balance(self) -> float:
         """Get available USDT balance."""
+        if self._balance is not None:
+            return self._balance
         try:
-            balance = self.exchange.fetch_balance({"type": "swap"})
-            usdt = balance.get("USDT", {})
-            available = float(usdt.get("free", 0) or 0)
-            logger.info(f"💰 Balance: ${available:.2f} USDT")
+            available = self._usdt_free(
+                await self.exchange.fetch_balance({"type": "swap"})
+            )
+            logger.info("💰 Balance: $%.2f USDT", available)
             return available
         except Exception as e:
-            logger.error(f"Error fetching balance: {e}")
+            logger.error("Error fetching balance: %s", e)
             return 0.0
 
     # ── Leverage ────────────────────────────────────────
 
-    def set_leverage(self, symbol: str, leverage: int = None):
+    async def set_leverage(self, symbol: str, leverage: int = None):
         """Set leverage for a symbol."""
         lev = leverage or config.DEFAULT_LEVERAGE
+        if (symbol, lev) in self._leverage_set:
+            return
         try:
-            self.exchange.set_leverage(lev, symbol)
-            logger.debug(f"Leverage set to {lev}x for {symbol}")
+            await self.exchange.set_leverage(lev, symbol)
+            self._leverage_set.add((symbol, lev))
+            logger.debug("Leverage set to %sx for %s", lev, symbol)
         except Exception as e:
             # Some pairs may already have the leverage set
-            logger.debug(f"Leverage note for {symbol}: {e}")
+            if "not modified" in str(e).lower():
+                self._leverage_set.add((symbol, lev))
+            logger.debug("Leverage note for %s: %s", symbol, e)
 
     # ── Open Position ──────────────────────────────────
 
-    def open_position(self, signal: Signal) -> Optional[dict]:
+    async def open_position(self, signal: Signal) -> Optional[dict]:
         """
         Open a real position based on a Signal.
         Returns order info dict or None on failure.
         """
         # ── Guard: block duplicate positions ────────────────
-        existing = self.get_position_for_symbol(signal.symbol)
+        existing = await self.get_position_for_symbol(signal.symbol)
         if existing:
             logger.warning(
-                f"⚠️ ДУБЛЬ ЗАБЛОКОВАНО: {signal.symbol} вже має позицію "
-                f"({existing['side']} {existing['contracts']} contracts)"
+                "⚠️ ДУБЛЬ ЗАБЛОКОВАНО: %s вже має позицію (%s %s contracts)",
+                signal.symbol, existing["side"], existing["contracts"],
             )
             return None
 
@@ -96,10 +207,10 @@ class BybitTrader:
             side = "buy" if signal.direction == Direction.LONG else "sell"
 
             # Set leverage
-            self.set_leverage(symbol)
+            await self.set_leverage(symbol)
 
             # Calculate position size in USDT
-            balance = self.get_balance()
+            balance = await self.get_balance()
             if balance <= 0:
                 logger.error("❌ No available balance")
                 return None
@@ -107,11 +218,10 @@ class BybitTrader:
             position_usd = balance * (signal.position_size_pct / 100)
 
             # Get minimum order size and price precision
-            market = self.exchange.market(symbol)
-            min_cost = market.get("limits", {}).get("cost", {}).get("min", 1)
+            min_cost, _, _ = self._get_market_limits(symbol)
             if position_usd < (min_cost or 1):
                 logger.error(
-                    f"❌ Position too small: ${position_usd:.2f} < min ${min_cost}"
+                    "❌ Position too small: $%.2f < min $%s", position_usd, min_cost
                 )
                 return None
 
@@ -120,23 +230,22 @@ class BybitTrader:
             amount = position_usd * config.DEFAULT_LEVERAGE / price
 
             # Round to market precision
-            amount_precision = market.get("precision", {}).get("amount", 8)
             amount = float(
                 self.exchange.amount_to_precision(symbol, amount)
             )
 
             if amount <= 0:
-                logger.error(f"❌ Calculated amount is 0 for {symbol}")
+                logger.error("❌ Calculated amount is 0 for %s", symbol)
                 return None
 
             logger.info(
-                f"📤 Opening {side.upper()} {symbol}: "
-                f"${position_usd:.2f} ({signal.position_size_pct}%) | "
-                f"Amount: {amount} | Leverage: {config.DEFAULT_LEVERAGE}x"
+                "📤 Opening %s %s: $%.2f (%s%%) | Amount: %s | Leverage: %sx",
+                side.upper(), symbol, position_usd, signal.position_size_pct,
+                amount, config.DEFAULT_LEVERAGE,
             )
 
             # Place market order
-            order = self.exchange.create_order(
+            order = await self.exchange.create_order(
                 symbol=symbol,
                 type="market",
                 side=side,
@@ -147,56 +256,29 @@ class BybitTrader:
             fill_price = float(order.get("average", price) or price)
 
             logger.info(
-                f"✅ Order filled: {symbol} {side.upper()} "
-                f"#{order_id} @ {fill_price}"
+                "✅ Order filled: %s %s #%s @ %s", symbol, side.upper(), order_id, fill_price
             )
 
-            # Set Stop Loss
+            # The position push can lag the fill; record it now so the cap and
+            # duplicate guards see it before the stream catches up
+            if self._positions is not None:
+                self._positions[symbol] = {
+                    "symbol": symbol,
+                    "side": "long" if side == "buy" else "short",
+                    "contracts": amount,
+                    "entry_price": fill_price,
+                    "mark_price": fill_price,
+                    "unrealized_pnl": 0.0,
+                    "leverage": float(config.DEFAULT_LEVERAGE),
+                    "notional": amount * fill_price,
+                }
+
+            # Protective SL and TP are independent requests — place them together
             sl_side = "sell" if side == "buy" else "buy"
-            try:
-                sl_price = float(
-                    self.exchange.price_to_precision(symbol, signal.stop_loss)
-                )
-                self.exchange.create_order(
-                    symbol=symbol,
-                    type="market",
-                    side=sl_side,
-                    amount=amount,
-                    params={
-                        "stopLoss": {
-                            "triggerPrice": sl_price,
-                            "type": "market",
-                        },
-                        "reduceOnly": True,
-                    },
-                )
-                logger.info(f"🛑 SL set at {sl_price}")
-            except Exception as e:
-                logger.warning(f"⚠️ Could not set SL: {e}")
-                # Try alternative method - set SL via set_trading_stop
-                try:
-                    self.exchange.set_trading_stop(
-                        symbol,
-                        stopLoss=sl_price,
-                        params={"positionIdx": 0},
-                    )
-                    logger.info(f"🛑 SL set via trading stop at {sl_price}")
-                except Exception as e2:
-                    logger.error(f"❌ Failed to set SL: {e2}")
-
-            # Set Take Profit (TP2 — full target)
-            try:
-                tp_price = float(
-                    self.exchange.price_to_precision(symbol, signal.take_profit_2)
-                )
-                self.exchange.set_trading_stop(
-                    symbol,
-                    takeProfit=tp_price,
-                    params={"positionIdx": 0},
-                )
-                logger.info(f"🎯 TP set at {tp_price}")
-            except Exception as e:
-                logger.warning(f"⚠️ Could not set TP: {e}")
+            await asyncio.gather(
+                self._place_sl(symbol, sl_side, amount, signal.stop_loss),
+                self._place_tp(symbol, signal.take_profit_2),
+            )
 
             return {
                 "order_id": order_id,
@@ -212,35 +294,77 @@ class BybitTrader:
             }
 
         except ccxt.InsufficientFunds as e:
-            logger.error(f"💸 Insufficient funds for {signal.symbol}: {e}")
+            logger.error("💸 Insufficient funds for %s: %s", signal.symbol, e)
             return None
         except ccxt.NetworkError as e:
-            logger.error(f"🌐 Network error opening {signal.symbol}: {e}")
+            logger.error("🌐 Network error opening %s: %s", signal.symbol, e)
             return None
         except Exception as e:
-            logger.error(f"❌ Error opening position {signal.symbol}: {e}")
+            logger.error("❌ Error opening position %s: %s", signal.symbol, e)
             return None
 
+    async def _place_sl(self, symbol: str, sl_side: str, amount: float, stop_loss: float):
+        """Place the stop-loss order, falling back to set_trading_stop."""
+        try:
+            sl_price = float(
+                self.exchange.price_to_precision(symbol, stop_loss)
+            )
+            await self.exchange.create_order(
+                symbol=symbol,
+                type="market",
+                side=sl_side,
+                amount=amount,
+                params={
+                    "stopLoss": {
+                        "triggerPrice": sl_price,
+                        "type": "market",
+                    },
+                    "reduceOnly": True,
+                },
+            )
+            logger.info("🛑 SL set at %s", sl_price)
+        except Exception as e:
+            logger.warning("⚠️ Could not set SL: %s", e)
+            # Try alternative method - set SL via set_trading_stop
+            try:
+                await self.exchange.set_trading_stop(
+                    symbol,
+                    stopLoss=sl_price,
+                    params={"positionIdx": 0},
+                )
+                logger.info("🛑 SL set via trading stop at %s", sl_price)
+            except Exception as e2:
+                logger.error("❌ Failed to set SL: %s", e2)
+
+    async def _place_tp(self, symbol: str, take_profit: float):
+        """Set the take-profit (TP2 — full target) on the position."""
+        try:
+            tp_price = float(
+                self.exchange.price_to_precision(symbol, take_profit)
+            )
+            await self.exchange.set_trading_stop(
+                symbol,
+                takeProfit=tp_price,
+                params={"positionIdx": 0},
+            )
+            logger.info("🎯 TP set at %s", tp_price)
+        except Exception as e:
+            logger.warning("⚠️ Could not set TP: %s", e)
+
     # ── Close Position ──────────────────────────────────
 
-    def close_position(self, symbol: str) -> Optional[dict]:
+    async def close_position(self, symbol: str) -> Optional[dict]:
         """Close an open position by placing opposite market order."""
         try:
-            positions = self.exchange.fetch_positions([symbol])
-            pos = None
-            for p in positions:
-                if p["symbol"] == symbol and float(p.get("contracts", 0) or 0) > 0:
-                    pos = p
-                    break
-
+            pos = await self._fetch_position(symbol)
             if not pos:
-                logger.info(f"No open position for {symbol}")
+                logger.info("No open position for %s", symbol)
                 return None
 
             side = "sell" if pos["side"] == "long" else "buy"
             amount = float(pos["contracts"])
 
-            order = self.exchange.create_order(
+            order = await self.exchange.create_order(
                 symbol=symbol,
                 type="market",
                 side=side,
@@ -249,7 +373,7 @@ class BybitTrader:
             )
 
             close_price = float(order.get("average", 0) or 0)
-            logger.info(f"🔒 Closed {symbol} @ {close_price}")
+            logger.info("🔒 Closed %s @ %s", symbol, close_price)
 
             return {
                 "symbol": symbol,
@@ -259,58 +383,78 @@ class BybitTrader:
             }
 
         except Exception as e:
-            logger.error(f"Error closing {symbol}: {e}")
+            logger.error("Error closing %s: %s", symbol, e)
             return None
 
     # ── Position Info ───────────────────────────────────
 
-    def get_open_positions(self) -> list[dict]:
+    @staticmethod
+    def _position_info(p: dict) -> dict:
+        """Flatten a CCXT position into the fields the bot uses."""
+        return {
+            "symbol": p["symbol"],
+            "side": p["side"],
+            "contracts": float(p.get("contracts", 0) or 0),
+            "entry_price": float(p.get("entryPrice", 0) or 0),
+            "mark_price": float(p.get("markPrice", 0) or 0),
+            "unrealized_pnl": float(p.get("unrealizedPnl", 0) or 0),
+            "leverage": float(p.get("leverage", 0) or 0),
+            "notional": float(p.get("notional", 0) or 0),
+        }
+
+    async def _fetch_position(self, symbol: str) -> Optional[dict]:
+        """Raw CCXT position for one symbol — fetches only that symbol."""
+        for p in await self.exchange.fetch_positions([symbol]):
+            if p["symbol"] == symbol and float(p.get("contracts", 0) or 0) > 0:
+                return p
+        return None
+
+    async def _fetch_open_positions(self) -> list[dict]:
+        positions = await self.exchange.fetch_positions()
+        return [
+            self._position_info(p) for p in positions
+            if float(p.get("contracts", 0) or 0) > 0
+        ]
+
+    async def get_open_positions(self) -> list[dict]:
         """Get all open positions."""
+        if self._positions is not None:
+            return list(self._positions.values())
         try:
-            positions = self.exchange.fetch_positions()
-            open_pos = []
-            for p in positions:
-                contracts = float(p.get("contracts", 0) or 0)
-                if contracts > 0:
-                    open_pos.append({
-                        "symbol": p["symbol"],
-                        "side": p["side"],
-                        "contracts": contracts,
-                        "entry_price": float(p.get("entryPrice", 0) or 0),
-                        "mark_price": float(p.get("markPrice", 0) or 0),
-                        "unrealized_pnl": float(p.get("unrealizedPnl", 0) or 0),
-                        "leverage": float(p.get("leverage", 0) or 0),
-                        "notional": float(p.get("notional", 0) or 0),
-                    })
-            return open_pos
+            return await self._fetch_open_positions()
         except Exception as e:
-            logger.error(f"Error fetching positions: {e}")
+            logger.error("Error fetching positions: %s", e)
             return []
 
-    def get_position_for_symbol(self, symbol: str) -> Optional[dict]:
+    async def get_position_for_symbol(self, symbol: str) -> Optional[dict]:
         """Get position info for a specific symbol."""
-        positions = self.get_open_positions()
-        for p in positions:
-            if p["symbol"] == symbol:
-                return p
-        return None
+        if self._positions is not None:
+            return self._positions.get(symbol)
+        try:
+            pos = await self._fetch_position(symbol)
+        except Exception as e:
+            logger.error("Error fetching position %s: %s", symbol, e)
+            return None
+        return self._position_info(pos) if pos else None
 
-    def get_real_pnl(self, symbol: str) -> Optional[float]:
+    async def get_real_pnl(self, symbol: str) -> Optional[float]:
         """Get unrealized PnL for a symbol."""
-        pos = self.get_position_for_symbol(symbol)
+        pos = await self.get_position_for_symbol(symbol)
         if pos:
             return pos["unrealized_pnl"]
         return None
 
     # ── Status ──────────────────────────────────────────
 
-    def format_positions_text(self) -> str:
+    async def format_positions_text(self) -> str:
         """Format open positions for Telegram."""
-        positions = self.get_open_positions()
+        # Two independent REST calls — run them side by side
+        positions, balance = await asyncio.gather(
+            self.get_open_positions(), self.get_balance(),
+        )
         if not positions:
             return "📭 Немає відкритих позицій на Bybit"
 
-        balance = self.get_balance()
         lines = [
             f"💱 *Bybit Positions* (Balance: `${balance:.2f}`):\n"
         ]